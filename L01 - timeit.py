@@ -1,33 +1,162 @@
+import gc
+from functools import wraps
+from dataclasses import dataclass, field
+from math import ceil, floor
+from statistics import mean, median, pstdev
 from time import perf_counter, sleep
 from random import random
 
 
-def timeit(n):  # Accept n as an argument
+TIMEIT_REGISTRY: dict[str, "TimeitStats"] = {}  # Last stats of every decorated function, by name
+
+
+@dataclass
+class TimeitStats:
     """
-    Used as a decorator. Executes the decorated function n times and prints the average execution time.
+    Result of a timed run. All times are in seconds.
+
+    Attributes
+    ----------
+    name: str
+        Name of the timed function.
+    n: int
+        Number of timed executions.
+    warmup: int
+        Number of untimed executions done before timing.
+    times: list[float]
+        Execution time of every timed execution, in order.
+    """
+
+    name: str
+    n: int
+    warmup: int
+    times: list[float] = field(repr=False)
+
+    @property
+    def total(self) -> float:
+        return sum(self.times)
+
+    @property
+    def mean(self) -> float:
+        return mean(self.times)
+
+    @property
+    def min(self) -> float:
+        return min(self.times)
+
+    @property
+    def max(self) -> float:
+        return max(self.times)
+
+    @property
+    def median(self) -> float:
+        return median(self.times)
+
+    @property
+    def stddev(self) -> float:
+        return pstdev(self.times)
+
+    @property
+    def p95(self) -> float:
+        return self.percentile(95)
+
+    @property
+    def p99(self) -> float:
+        return self.percentile(99)
+
+    def percentile(self, q: float) -> float:
+        """
+        Returns the q-th percentile (0 <= q <= 100) of the execution times, interpolating linearly.
+        """
+        if not 0 <= q <= 100:
+            raise ValueError("q debe estar entre 0 y 100")
+        ordered = sorted(self.times)
+        pos = (len(ordered) - 1) * q / 100
+        lo, hi = floor(pos), ceil(pos)
+        return ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+
+    def as_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "n": self.n,
+            "warmup": self.warmup,
+            "total": self.total,
+            "mean": self.mean,
+            "min": self.min,
+            "max": self.max,
+            "median": self.median,
+            "stddev": self.stddev,
+            "p95": self.p95,
+            "p99": self.p99,
+        }
+
+    def __str__(self) -> str:
+        return (
+            f"@timeit Function {self.name}: {self.n} iterations ({self.warmup} warmup) "
+            f"mean {self.mean:.6f}s, min {self.min:.6f}s, median {self.median:.6f}s, "
+            f"p95 {self.p95:.6f}s, p99 {self.p99:.6f}s, stddev {self.stddev:.6f}s"
+        )
+
+
+def timeit(n, warmup: int = 0, disable_gc: bool = False, verbose: bool = False, setup=None):  # Accept n as an argument
+    """
+    Used as a decorator. Executes the decorated function n times and records its execution time statistics.
+
+    The stats of the last call are stored in ``wrapper.last_stats`` and in ``TIMEIT_REGISTRY``
+    under the function's name. Nothing is printed inside the timing loop.
 
     Parameters
     ----------
     n: int
         Number of times to execute the function.
+    warmup: int
+        Number of untimed executions before timing. Defaults to 0.
+    disable_gc: bool
+        Whether to disable the garbage collector while timing. Defaults to False.
+    verbose: bool
+        Whether to print a summary once timing is done. Defaults to False.
+    setup: Callable
+        Optional function called with the same arguments before every execution (untimed),
+        e.g. to restore an input list that the function sorts in place. Defaults to None.
     """
+    if n < 1:
+        raise ValueError("n debe ser al menos 1")
 
     def decorator(f): # This is the actual decorator
+        @wraps(f)
         def wrapper(*args, **kwargs):
-            exec_time = 0
+            times = [0.0] * n
             return_value = None  # Inicializar
 
-            for i in range(n):
-                start = perf_counter()
-                return_value = f(*args, **kwargs)  # Important to calculate the return value inside the loop
-                end = perf_counter()
-                exec_time += end - start
-                avg_time = exec_time / n
-                print(
-                    f"@timeit Function {f.__name__}: Average execution time {avg_time:.6f} seconds over {n} iterations."
-                )
+            for _ in range(warmup):
+                if setup is not None:
+                    setup(*args, **kwargs)
+                f(*args, **kwargs)
+
+            gc_was_enabled = gc.isenabled()
+            if disable_gc:
+                gc.collect()
+                gc.disable()
+            try:
+                for i in range(n):
+                    if setup is not None:
+                        setup(*args, **kwargs)
+                    start = perf_counter()
+                    return_value = f(*args, **kwargs)  # Important to calculate the return value inside the loop
+                    end = perf_counter()
+                    times[i] = end - start
+            finally:
+                if disable_gc and gc_was_enabled:
+                    gc.enable()
+
+            stats = TimeitStats(f.__name__, n, warmup, times)
+            wrapper.last_stats = stats
+            TIMEIT_REGISTRY[f.__name__] = stats
+            if verbose:
+                print(stats)
             return return_value
 
+        wrapper.last_stats = None
         return wrapper
 
     return decorator # Return the decorator
@@ -35,9 +164,11 @@ def timeit(n):  # Accept n as an argument
 
 if __name__ == "__main__":
 
-    @timeit(5)
+    @timeit(5, warmup=1, disable_gc=True)
     def example_function():
         # This is where I would do something useful
         sleep(1 * random())
 
-    example_function()
\ No newline at end of file
+    example_function()
+    print(example_function.last_stats)
+    print(TIMEIT_REGISTRY["example_function"].as_dict())
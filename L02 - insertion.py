@@ -19,17 +19,21 @@ def insertion_sort(
         Whether to sort in decreasing order or not. Defaults to False.
     """
     n = len(A)
+    keys = [key(x) for x in A]  # Cada clave se calcula una sola vez
 
     for i in range(1, n):
         current = A[i]
+        current_key = keys[i]
         j = i - 1
 
         # Determinar la comparación según reverse
-        while j >= 0 and (key(A[j]) > key(current) if not reverse else key(A[j]) < key(current)):
+        while j >= 0 and (keys[j] > current_key if not reverse else keys[j] < current_key):
             A[j + 1] = A[j]  # Desplazar elementos hacia la derecha
+            keys[j + 1] = keys[j]
             j -= 1
 
         A[j + 1] = current  # Insertar el elemento en su posición correcta
+        keys[j + 1] = current_key
 
 
 if __name__ == "__main__":
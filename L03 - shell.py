@@ -20,19 +20,23 @@ def shell_sort(
         Whether to sort in decreasing order or not. Defaults to False.
     """
     n = len(A)
+    keys = [key(x) for x in A]  # Cada clave se calcula una sola vez
     gap = n // 2  # Salto de n/2
 
     while gap > 0:
         for i in range(gap, n):
             temp = A[i]
+            temp_key = keys[i]
             j = i
 
             # Determinar la comparación según reverse
-            while j >= gap and (key(A[j - gap]) > key(temp) if not reverse else key(A[j - gap]) < key(temp)):
+            while j >= gap and (keys[j - gap] > temp_key if not reverse else keys[j - gap] < temp_key):
                 A[j] = A[j - gap]
+                keys[j] = keys[j - gap]
                 j -= gap
 
             A[j] = temp
+            keys[j] = temp_key
 
         gap //= 2  # Reducir el salto
 
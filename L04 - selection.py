@@ -19,15 +19,19 @@ def selection_sort(
         Whether to sort in decreasing order or not. Defaults to False.
     """
     n = len(A)
+    keys = [key(x) for x in A]  # Cada clave se calcula una sola vez
 
     for i in range(n - 1):
         extreme_index = i
+        extreme_key = keys[i]
 
         for j in range(i + 1, n):
-            if (key(A[j]) < key(A[extreme_index]) and not reverse) or (key(A[j]) > key(A[extreme_index]) and reverse):
+            if (keys[j] < extreme_key and not reverse) or (keys[j] > extreme_key and reverse):
                 extreme_index = j
+                extreme_key = keys[j]
 
         A[i], A[extreme_index] = A[extreme_index], A[i]  # Intercambio de elementos
+        keys[i], keys[extreme_index] = keys[extreme_index], keys[i]
 
 
 if __name__ == "__main__":
@@ -1,9 +1,32 @@
+from array import array
+
+
 class Stack:
-    def __init__(self, s=None) -> None:
-        self._stack = s
+    """
+    LIFO stack. By default it wraps the list s (used as is). With a typecode the elements are
+    stored unboxed in an array.array of that type ("q" for 64-bit ints, "d" for floats...), which
+    grows geometrically like a list but takes 8 bytes per number instead of a pointer plus an
+    object.
+
+    Parameters
+    ----------
+    s: list
+        Initial elements, bottom first. Defaults to an empty stack.
+    typecode: str
+        array.array typecode of the elements. Defaults to None (any Python object).
+    """
+
+    def __init__(self, s=None, typecode: str = None) -> None:
+        if typecode is not None:
+            self._stack = array(typecode, s if s is not None else ())
+        else:
+            self._stack = s if s is not None else []
 
     def __repr__(self) -> str:
-        return str(self._stack)
+        return str(self._stack if isinstance(self._stack, list) else self._stack.tolist())
+
+    def __len__(self) -> int:
+        return len(self._stack)
 
     def top(self):
         if self.is_empty():
@@ -18,12 +41,35 @@ class Stack:
     def push(self, e) -> None:
         self._stack.append(e)
 
+    def push_many(self, items) -> None:
+        # Apila los elementos en orden: el último queda en la cima
+        self._stack.extend(items)
+
+    def pop_many(self, k: int):
+        # Desapila hasta k elementos y los devuelve en el orden en que salen (la cima primero)
+        if k < 0:
+            raise ValueError("k no puede ser negativo")
+        k = min(k, len(self._stack))
+        if k == 0:
+            return self._stack[:0]
+        items = self._stack[-k:]
+        del self._stack[-k:]
+        items.reverse()
+        return items
+
+    def snapshot(self) -> memoryview:
+        # Vista sin copia del contenido (fondo primero) de una pila con typecode. Mientras la vista
+        # exista el array no puede cambiar de tamaño: hay que liberarla (release) antes de apilar
+        if isinstance(self._stack, list):
+            raise TypeError("snapshot solo está disponible en pilas creadas con typecode")
+        return memoryview(self._stack)
+
     def is_empty(self) -> bool:
         #True vacia - False contrario
         return len(self._stack) == 0
 
     def clear(self) -> None:
-        self._stack.clear()
+        del self._stack[:]
 
 
 if __name__ == "__main__":
@@ -47,4 +93,15 @@ if __name__ == "__main__":
     # False
     S.clear()
     print(S.is_empty())
-    # True
\ No newline at end of file
+    # True
+
+    T = Stack(typecode="q")
+    T.push_many(range(10))
+    print(T.pop_many(3), T.top())
+    # array('q', [9, 8, 7]) 6
+    with T.snapshot() as view:
+        print(view.nbytes, view[-1])
+    # 56 6
+    T.push(-1)
+    print(T, len(T))
+    # [0, 1, 2, 3, 4, 5, 6, -1] 8
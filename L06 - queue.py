@@ -1,6 +1,117 @@
+from multiprocessing import Lock
+from multiprocessing.shared_memory import SharedMemory
+from struct import pack_into, unpack_from
+from time import perf_counter
+
+
 class Queue:
+    """
+    FIFO queue stored in a growable circular buffer: head and size index into a list whose length
+    is a power of two, so peek, poll and offer are O(1) (offer amortised when the buffer doubles).
+
+    Parameters
+    ----------
+    q: list
+        Initial elements, front first. The list is copied. Defaults to an empty queue.
+    capacity: int
+        Maximum number of elements. offer raises IndexError when the queue is full. Defaults to
+        None (unbounded).
+    """
+
+    def __init__(self, q=None, capacity: int = None) -> None:
+        if capacity is not None and capacity < 1:
+            raise ValueError("capacity debe ser al menos 1")
+        self.capacity = capacity
+        self.clear()
+        if q:
+            self.offer_many(q)
+
+    def __repr__(self) -> str:
+        return str(list(self))
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self):
+        # Recorre la cola de delante hacia atrás sin copiarla
+        buf, mask = self._buf, len(self._buf) - 1
+        for i in range(self._head, self._head + self._size):
+            yield buf[i & mask]
+
+    def _grow(self, needed: int) -> None:
+        # Copia los elementos al principio de un buffer nuevo de tamaño potencia de dos >= needed
+        n = len(self._buf)
+        while n < needed:
+            n <<= 1
+        items = list(self)
+        self._buf = items + [None] * (n - len(items))
+        self._head = 0
+
+    def peek(self):
+        if self.is_empty():
+            raise IndexError("La cola está vacía")
+        return self._buf[self._head]
+
+    def poll(self):
+        if self.is_empty():
+            raise IndexError("La cola está vacía")
+        buf, head = self._buf, self._head
+        e = buf[head]
+        buf[head] = None  # No retener referencias a elementos ya extraídos
+        self._head = (head + 1) & (len(buf) - 1)
+        self._size -= 1
+        return e
+
+    def offer(self, e) -> None:
+        if self.capacity is not None and self._size >= self.capacity:
+            raise IndexError("La cola está llena")
+        if self._size == len(self._buf):
+            self._grow(self._size + 1)
+        self._buf[(self._head + self._size) & (len(self._buf) - 1)] = e
+        self._size += 1
+
+    def offer_many(self, items) -> None:
+        # Inserta todos los elementos (o ninguno si no caben) copiando como mucho dos tramos
+        items = list(items)
+        k = len(items)
+        if self.capacity is not None and self._size + k > self.capacity:
+            raise IndexError("La cola está llena")
+        if self._size + k > len(self._buf):
+            self._grow(self._size + k)
+        n = len(self._buf)
+        start = (self._head + self._size) & (n - 1)
+        first = min(k, n - start)
+        self._buf[start:start + first] = items[:first]
+        self._buf[:k - first] = items[first:]
+        self._size += k
+
+    def poll_many(self, k: int) -> list:
+        # Extrae hasta k elementos (menos si la cola no tiene tantos), en orden
+        if k < 0:
+            raise ValueError("k no puede ser negativo")
+        k = min(k, self._size)
+        n = len(self._buf)
+        first = min(k, n - self._head)
+        items = self._buf[self._head:self._head + first] + self._buf[:k - first]
+        self._buf[self._head:self._head + first] = [None] * first
+        self._buf[:k - first] = [None] * (k - first)
+        self._head = (self._head + k) & (n - 1)
+        self._size -= k
+        return items
+
+    def is_empty(self) -> bool:
+        return self._size == 0
+
+    def clear(self) -> None:
+        self._buf = [None] * 8
+        self._head = 0
+        self._size = 0
+
+
+class ListQueue:
+    # Implementación original sobre una lista: poll es O(n). Se mantiene como referencia
     def __init__(self, q=None) -> None:
-        self._queue = q
+        self._queue = q if q is not None else []
 
     def __repr__(self) -> str:
         return str(self._queue)
@@ -24,6 +135,201 @@ class Queue:
     def clear(self) -> None:
         self._queue.clear()
 
+
+class SharedQueue:
+    """
+    FIFO queue of byte records in a ring buffer in shared memory, usable from several processes.
+
+    Records are framed as a 4-byte length followed by the payload, padded to 8 bytes, and are
+    never split at the end of the buffer (a wrap marker sends the reader back to the start), so
+    poll can hand out a memoryview straight into the shared buffer. The header holds two 64-bit
+    counters, head (advanced only by the consumer) and tail (advanced only by the producers),
+    each written after the data it publishes. With a single producer and a single consumer no
+    lock is taken; with multi_producer=True the producers serialise on a multiprocessing.Lock.
+    There must be a single consumer.
+
+    Pass the queue to child processes as a Process argument, or attach to it by name.
+
+    Parameters
+    ----------
+    capacity: int
+        Size of the ring buffer in bytes, rounded up to a power of two. When attaching by name it
+        must be the capacity the queue was created with. Defaults to 1 MiB.
+    multi_producer: bool
+        Whether several processes call offer. Defaults to False.
+    name: str
+        Name of an existing SharedQueue to attach to. Defaults to None (create a new one).
+    lock: multiprocessing.Lock
+        Lock shared by the producers. Created automatically when a multi-producer queue is
+        created; required when attaching by name with multi_producer=True.
+    """
+
+    HEADER = 64  # head y tail, cada uno en su propia mitad de línea de caché
+    WRAP = 0xFFFFFFFF
+
+    def __init__(self, capacity: int = 1 << 20, multi_producer: bool = False, name: str = None, lock=None) -> None:
+        size = 64
+        while size < capacity:
+            size <<= 1
+        if name is not None and multi_producer and lock is None:
+            # Un Lock nuevo solo lo vería este proceso: los productores no se excluirían entre sí
+            raise ValueError("Para unirse como productor múltiple hay que pasar el lock compartido")
+        if name is None:
+            self._shm = SharedMemory(create=True, size=self.HEADER + size)
+            self._shm.buf[:self.HEADER] = bytes(self.HEADER)
+        else:
+            # Se usa la capacidad indicada: el sistema puede redondear el segmento hacia arriba
+            self._shm = SharedMemory(name)
+            if self._shm.size < self.HEADER + size:
+                self._shm.close()
+                raise ValueError("El segmento es más pequeño que la capacidad indicada")
+        self.capacity = size
+        self.multi_producer = multi_producer
+        self._lock = lock if lock is not None or not multi_producer else Lock()
+        self._counters = self._shm.buf[:16].cast("Q")  # [head, tail]
+        self._data = self._shm.buf[self.HEADER:self.HEADER + size]
+        self._pending = None  # Fin del último registro devuelto por poll, aún sin liberar
+
+    def __reduce__(self):
+        return (SharedQueue, (self.capacity, self.multi_producer, self.name, self._lock))
+
+    def __len__(self) -> int:
+        # Número de registros en la cola (recorre las cabeceras)
+        n, pos = 0, self._committed_head()
+        tail = self._counters[1]
+        while pos < tail:
+            length = unpack_from("<I", self._data, pos & (self.capacity - 1))[0]
+            if length == self.WRAP:
+                pos = (pos | (self.capacity - 1)) + 1
+                continue
+            pos += (length + 11) & ~7
+            n += 1
+        return n
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def _committed_head(self) -> int:
+        return self._counters[0] if self._pending is None else self._pending
+
+    def _write(self, data) -> None:
+        data = memoryview(data).cast("B")
+        n = len(data)
+        size = (n + 11) & ~7  # Cabecera de 4 bytes + datos, redondeado a 8
+        if size > self.capacity:
+            raise ValueError("El registro no cabe en la cola")
+        cap, mask = self.capacity, self.capacity - 1
+        tail = self._counters[1]
+        pos = tail & mask
+        skip = cap - pos if pos + size > cap else 0  # El registro no se parte: se salta al principio
+        if tail + skip + size - self._counters[0] > cap:
+            raise IndexError("La cola está llena")
+        if skip:
+            pack_into("<I", self._data, pos, self.WRAP)
+            pos = 0
+        pack_into("<I", self._data, pos, n)
+        self._data[pos + 4:pos + 4 + n] = data
+        self._counters[1] = tail + skip + size  # Se publica después de escribir los datos
+
+    def offer(self, e) -> None:
+        # e es cualquier objeto que soporte el protocolo de buffer (bytes, bytearray, memoryview, array...)
+        if self._lock is None:
+            self._write(e)
+        else:
+            with self._lock:
+                self._write(e)
+
+    def _next(self):
+        # Devuelve (inicio, longitud, fin) del primer registro sin consumir, o None si está vacía
+        head, tail = self._committed_head(), self._counters[1]
+        if head == tail:
+            return None
+        pos = head & (self.capacity - 1)
+        length = unpack_from("<I", self._data, pos)[0]
+        if length == self.WRAP:
+            head = (head | (self.capacity - 1)) + 1
+            pos = 0
+            length = unpack_from("<I", self._data, 0)[0]
+        return pos, length, head + ((length + 11) & ~7)
+
+    def release(self) -> None:
+        # Devuelve a los productores el espacio del último registro extraído con poll
+        if self._pending is not None:
+            self._counters[0] = self._pending
+            self._pending = None
+
+    def peek(self) -> memoryview:
+        record = self._next()
+        if record is None:
+            raise IndexError("La cola está vacía")
+        pos, length, _ = record
+        return self._data[pos + 4:pos + 4 + length]
+
+    def poll(self) -> memoryview:
+        # Sin copia: la vista apunta al buffer compartido y es válida hasta el siguiente poll o release
+        self.release()
+        record = self._next()
+        if record is None:
+            raise IndexError("La cola está vacía")
+        pos, length, end = record
+        self._pending = end
+        return self._data[pos + 4:pos + 4 + length]
+
+    def is_empty(self) -> bool:
+        return self._committed_head() == self._counters[1]
+
+    def clear(self) -> None:
+        # Solo el consumidor: descarta todo lo publicado hasta ahora
+        self._pending = None
+        self._counters[0] = self._counters[1]
+
+    def close(self) -> None:
+        self._counters.release()
+        self._data.release()
+        self._shm.close()
+
+    def unlink(self) -> None:
+        self._shm.unlink()
+
+
+def _produce(Q: SharedQueue, start: int, n: int) -> None:
+    for i in range(start, start + n):
+        while True:
+            try:
+                Q.offer(i.to_bytes(8, "little"))
+                break
+            except IndexError:  # Cola llena: se reintenta
+                pass
+    Q.close()
+
+
+def benchmark(sizes=(1_000, 10_000, 100_000)) -> None:
+    """
+    Prints the time to fill and then drain a queue of each size with ListQueue and Queue, one
+    element at a time, plus Queue with offer_many/poll_many in batches of 1000.
+    """
+    print(f"{'n':>9} {'ListQueue':>11} {'Queue':>11} {'Queue batch':>12}")
+    for n in sizes:
+        times = []
+        for cls in (ListQueue, Queue):
+            start = perf_counter()
+            Q = cls()
+            for i in range(n):
+                Q.offer(i)
+            while not Q.is_empty():
+                Q.poll()
+            times.append(perf_counter() - start)
+        start = perf_counter()
+        Q = Queue()
+        for i in range(0, n, 1000):
+            Q.offer_many(range(i, min(i + 1000, n)))
+        while not Q.is_empty():
+            Q.poll_many(1000)
+        times.append(perf_counter() - start)
+        print(f"{n:>9} {times[0]:>10.4f}s {times[1]:>10.4f}s {times[2]:>11.4f}s")
+
+
 if __name__ == "__main__":
 
     Q = Queue([3, 2, 5, 1, 9, 0, 8, 6, 7, 4])
@@ -40,9 +346,45 @@ if __name__ == "__main__":
     # [2, 5, 1, 9, 0, 8, 6, 7, 4]
     Q.offer(-1)
     print(Q)
-    # [-1, 2, 5, 1, 9, 0, 8, 6, 7]
+    # [2, 5, 1, 9, 0, 8, 6, 7, 4, -1]
     print(Q.is_empty())
     # False
+    Q.offer_many([10, 11, 12])
+    print(Q.poll_many(4))
+    # [2, 5, 1, 9]
+    print(len(Q), list(Q))
+    # 9 [0, 8, 6, 7, 4, -1, 10, 11, 12]
     Q.clear()
     print(Q.is_empty())
-    # True
\ No newline at end of file
+    # True
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Demo de Queue")
+    parser.add_argument("--benchmark", action="store_true", help="compara ListQueue y Queue")
+    parser.add_argument("--shared", action="store_true", help="demo de SharedQueue con dos procesos productores")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark()
+
+    if args.shared:
+        from multiprocessing import Process
+
+        S = SharedQueue(capacity=4096, multi_producer=True)
+        producers = [Process(target=_produce, args=(S, w * 1000, 1000)) for w in range(2)]
+        for p in producers:
+            p.start()
+        received = []
+        while len(received) < 2000:
+            try:
+                received.append(int.from_bytes(S.poll(), "little"))
+            except IndexError:
+                pass
+        for p in producers:
+            p.join()
+        print(sorted(received) == list(range(2000)), S.is_empty())
+        # True True
+        S.release()
+        S.close()
+        S.unlink()
@@ -1,6 +1,219 @@
+from bisect import bisect_right
+from itertools import accumulate, chain
+from math import isqrt
+
+
+class BlockList:
+    """
+    List stored as a sequence of blocks of about block_size elements (unrolled linked list /
+    sqrt decomposition). get, insert and pop at any position cost O(number of blocks + block
+    size), which is O(sqrt(n)) with the default block size, instead of the O(n) shift of a list.
+
+    Block start offsets are kept in a prefix list that is recomputed lazily, and only from the
+    first block that changed. With index_values=True a dictionary maps every value to the blocks
+    that contain it, so index only scans one block; the values must then be hashable.
+
+    Parameters
+    ----------
+    items: Iterable
+        Initial elements. Defaults to an empty list.
+    block_size: int
+        Target number of elements per block. Blocks are split at twice this size and merged with
+        their neighbour below a quarter of it. Defaults to sqrt(n), at least 64, retuned as the
+        list grows: when there are more than 2 * sqrt(n) blocks the list is rebuilt with blocks of
+        sqrt(n) elements (amortised O(1) per insertion, since n must grow about 4x in between).
+    index_values: bool
+        Whether to keep the value -> blocks index. Defaults to False.
+    """
+
+    def __init__(self, items=(), block_size: int = None, index_values: bool = False) -> None:
+        self._auto = block_size is None
+        self._index = {} if index_values else None  # valor -> {id(bloque): apariciones}
+        self._build(list(items), block_size)
+
+    def _build(self, items, block_size=None) -> None:
+        self._load = block_size or max(64, isqrt(len(items)))
+        self._blocks = [items[i:i + self._load] for i in range(0, len(items), self._load)]
+        self._size = len(items)
+        self._offsets = []
+        self._dirty = 0  # Primer bloque cuyo offset puede estar desactualizado
+        self._order = None  # id(bloque) -> posición del bloque, se reconstruye al cambiar los bloques
+        if self._index is not None:
+            self._index.clear()
+            for block in self._blocks:
+                self._index_add(block, block)
+
+    def _retune(self) -> None:
+        # Tamaño de bloque automático: si hay demasiados bloques para n, se reconstruye con bloques de sqrt(n)
+        if self._auto and len(self._blocks) > 2 * isqrt(self._size):
+            self._build(list(self))
+
+    def __repr__(self) -> str:
+        return str(list(self))
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self):
+        return chain.from_iterable(self._blocks)
+
+    def _index_add(self, block, values) -> None:
+        if self._index is None:
+            return
+        b = id(block)
+        for e in values:
+            counts = self._index.setdefault(e, {})
+            counts[b] = counts.get(b, 0) + 1
+
+    def _index_remove(self, block, values) -> None:
+        if self._index is None:
+            return
+        b = id(block)
+        for e in values:
+            counts = self._index[e]
+            if counts[b] == 1:
+                del counts[b]
+                if not counts:
+                    del self._index[e]
+            else:
+                counts[b] -= 1
+
+    def _refresh_offsets(self) -> None:
+        blocks, d = self._blocks, self._dirty
+        if d >= len(blocks):
+            del self._offsets[len(blocks):]
+            return
+        start = self._offsets[d - 1] + len(blocks[d - 1]) if d > 0 else 0
+        self._offsets[d:] = accumulate((len(b) for b in blocks[d:-1]), initial=start)
+        self._dirty = len(blocks)
+
+    def _locate(self, i: int) -> tuple[int, int]:
+        # Devuelve (bloque, posición dentro del bloque) del elemento i
+        if i < 0:
+            i += self._size
+        if not 0 <= i < self._size:
+            raise IndexError("Índice fuera de rango")
+        self._refresh_offsets()
+        b = bisect_right(self._offsets, i) - 1
+        return b, i - self._offsets[b]
+
+    def _blocks_changed(self, b: int) -> None:
+        self._dirty = min(self._dirty, b)
+        self._order = None
+
+    def _split(self, b: int) -> None:
+        block = self._blocks[b]
+        if len(block) <= 2 * self._load:
+            return
+        tail = block[self._load:]
+        del block[self._load:]
+        self._blocks.insert(b + 1, tail)
+        self._index_remove(block, tail)
+        self._index_add(tail, tail)
+        self._blocks_changed(b + 1)
+
+    def _merge(self, b: int) -> None:
+        # Junta el bloque b con el siguiente (o lo elimina si quedó vacío)
+        block = self._blocks[b]
+        if not block:
+            del self._blocks[b]
+            self._blocks_changed(b)
+            return
+        if len(block) >= self._load // 4 or b + 1 >= len(self._blocks):
+            return
+        following = self._blocks.pop(b + 1)
+        self._index_remove(following, following)
+        self._index_add(block, following)
+        block.extend(following)
+        self._blocks_changed(b + 1)
+        self._split(b)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return list(self)[i]
+        b, j = self._locate(i)
+        return self._blocks[b][j]
+
+    def append(self, e) -> None:
+        if not self._blocks:
+            self._blocks.append([])
+            self._blocks_changed(0)
+        b = len(self._blocks) - 1
+        self._blocks[b].append(e)
+        self._index_add(self._blocks[b], (e,))
+        self._size += 1
+        self._split(b)
+        self._retune()
+
+    def insert(self, i: int, e) -> None:
+        if i < 0:
+            i = max(0, i + self._size)
+        if i >= self._size:
+            return self.append(e)
+        b, j = self._locate(i)
+        block = self._blocks[b]
+        block.insert(j, e)
+        self._index_add(block, (e,))
+        self._size += 1
+        self._dirty = min(self._dirty, b + 1)
+        self._split(b)
+        self._retune()
+
+    def pop(self, i: int = -1):
+        b, j = self._locate(i)
+        block = self._blocks[b]
+        e = block.pop(j)
+        self._index_remove(block, (e,))
+        self._size -= 1
+        self._dirty = min(self._dirty, b + 1)
+        self._merge(b)
+        return e
+
+    def index(self, e) -> int:
+        # Posición de la primera aparición de e; lanza ValueError si no está
+        self._refresh_offsets()
+        if self._index is None:
+            for b, block in enumerate(self._blocks):
+                if e in block:
+                    return self._offsets[b] + block.index(e)
+            raise ValueError(f"{e!r} no está en la lista")
+        counts = self._index.get(e)
+        if not counts:
+            raise ValueError(f"{e!r} no está en la lista")
+        if self._order is None:
+            self._order = {id(block): b for b, block in enumerate(self._blocks)}
+        b = min(self._order[block_id] for block_id in counts)
+        return self._offsets[b] + self._blocks[b].index(e)
+
+    def __contains__(self, e) -> bool:
+        if self._index is not None:
+            return e in self._index
+        return any(e in block for block in self._blocks)
+
+    def clear(self) -> None:
+        self._blocks.clear()
+        self._offsets.clear()
+        self._size = 0
+        self._dirty = 0
+        self._order = None
+        if self._index is not None:
+            self._index.clear()
+
+
 class My_List:
-    def __init__(self, l: list[any]) -> None:
-        self._list = l
+    """
+    List with add/get/remove/index_of/size. The backend is a plain list (which is used as is) or,
+    with backend="blocked", a BlockList built from l, where inserting and removing in the middle
+    cost O(sqrt(n)) instead of O(n). index_values enables the value index of BlockList.
+    """
+
+    def __init__(self, l: list[any], backend: str = "list", index_values: bool = False, block_size: int = None) -> None:
+        if backend == "list":
+            self._list = l
+        elif backend == "blocked":
+            self._list = BlockList(l, block_size, index_values)
+        else:
+            raise ValueError("backend debe ser 'list' o 'blocked'")
 
     def __repr__(self) -> str:
         return str(self._list)
@@ -8,6 +221,9 @@ class My_List:
     def add(self, e) -> None:
         self._list.append(e)
 
+    def insert(self, i, e) -> None:
+        self._list.insert(i, e)
+
     def get(self, i):
         return self._list[i]
 
@@ -47,3 +263,8 @@ if __name__ == "__main__":
     # 5
     print(L.size())
     # 10
+
+    B = My_List([3, 2, 5, 1, 9, 0, 8, 6, 7, 4], backend="blocked", index_values=True)
+    B.insert(3, 8)
+    print(B.remove(0), B.index_of(8), B.index_of(42), B.size())
+    # 3 2 -1 10
@@ -1,19 +1,22 @@
 from enum import Enum
+from operator import gt, lt
 from typing import TypeVar, Callable
 
 T = TypeVar("T")
 
 
-def parent(i):
-    return i >> 1
+def parent(i, d=2):
+    return (i - 1) // d
 
 
-def left(i):
-    return i << 1
+def left(i, d=2):
+    # First child of node i
+    return d * i + 1
 
 
-def right(i):
-    return (i << 1) + 1
+def right(i, d=2):
+    # Last child of node i (the right child in a binary heap)
+    return d * i + d
 
 
 class HeapType(Enum):
@@ -22,69 +25,152 @@ class HeapType(Enum):
 
 
 class Heap:
+    """
+    Binary heap stored 0-indexed in a list, with the key of every element computed once and
+    cached in a parallel list. The comparison is chosen once, at construction time.
+
+    Parameters
+    ----------
+    A: list[T]
+        Elements of the heap.
+    heapType: HeapType
+        HeapType.MAX (largest key on top) or HeapType.MIN. Defaults to HeapType.MAX.
+    key: Callable
+        Function used to compare elements. Defaults to comparing the elements themselves.
+    in_place: bool
+        Whether to heapify A itself instead of a copy. The caller's list is then rearranged by
+        every heap operation. Defaults to False.
+    arity: int
+        Number of children per node (d-ary heap). Wider heaps are shallower: sift-up (insert,
+        decrease-key) gets cheaper while sift-down (extract) compares more children per level.
+        Defaults to 2.
+    """
+
     def __init__(
         self,
         A: list[T],
         heapType: HeapType = HeapType.MAX,
         key: Callable = lambda x: x,
+        in_place: bool = False,
+        arity: int = 2,
     ) -> None:
-        self._heap = [None] + list(A)  # Make the array 1-indexed
+        if arity < 2:
+            raise ValueError("arity debe ser al menos 2")
+        self.arity = arity
+        self._heap = A if in_place else list(A)
         self._key = key
+        self._keys = [key(x) for x in A]  # Keys computed once, kept aligned with _heap
         self.heap_size = len(A)
         self.type = heapType
+        self._before = gt if heapType == HeapType.MAX else lt  # _before(a, b): key a goes above key b
         self.build_heap()
 
     def __repr__(self):
-        return str(self._heap[1 : self.heap_size + 1])
+        return str(self._heap[: self.heap_size])
+
+    def _compare_at(self, i, j) -> bool:
+        # True if the element at i may be above the one at j (j doesn't have to go above i)
+        return not self._before(self._keys[j], self._keys[i])
 
-    def _compare_eq(self, a, b) -> bool:
-        return (
-            self._key(a) >= self._key(b)
-            if self.type == HeapType.MAX
-            else self._key(a) <= self._key(b)
-        )
+    def _swap(self, i, j) -> None:
+        self._heap[i], self._heap[j] = self._heap[j], self._heap[i]
+        self._keys[i], self._keys[j] = self._keys[j], self._keys[i]
 
     def assert_heap_property(self) -> None:
-        for i in range(2, self.heap_size + 1):
-            assert self._compare_eq(
-                self._heap[parent(i)], self._heap[i]
-            ), f"{self._heap[parent(i)]}, {self._heap[i]}, {self.type}"
+        for i in range(1, self.heap_size):
+            p = parent(i, self.arity)
+            assert self._compare_at(p, i), f"{self._heap[p]}, {self._heap[i]}, {self.type}"
 
     def heapify(self, i) -> None:
-        l = left(i)
-        r = right(i)
-        largest_or_smallest = i
-
-        if l <= self.heap_size and not self._compare_eq(self._heap[largest_or_smallest], self._heap[l]):
-            largest_or_smallest = l
-        if r <= self.heap_size and not self._compare_eq(self._heap[largest_or_smallest], self._heap[r]):
-            largest_or_smallest = r
-
-        if largest_or_smallest != i:
-            self._heap[i], self._heap[largest_or_smallest] = self._heap[largest_or_smallest], self._heap[i]
-            self.heapify(largest_or_smallest)
+        # Iterative sift-down: the element at i moves down a hole instead of being swapped at each level
+        heap, keys, before, size, d = self._heap, self._keys, self._before, self.heap_size, self.arity
+        item, k = heap[i], keys[i]
+        first = left(i, d)
+        while first < size:
+            child = first
+            for c in range(first + 1, min(right(i, d) + 1, size)):
+                if before(keys[c], keys[child]):
+                    child = c
+            if not before(keys[child], k):
+                break
+            heap[i], keys[i] = heap[child], keys[child]
+            i = child
+            first = left(i, d)
+        heap[i], keys[i] = item, k
+
+    def sift_up(self, i) -> int:
+        # Moves the element at i up while it goes above its parent; returns its final position
+        heap, keys, before, d = self._heap, self._keys, self._before, self.arity
+        item, k = heap[i], keys[i]
+        while i > 0:
+            p = parent(i, d)
+            if not before(k, keys[p]):
+                break
+            heap[i], keys[i] = heap[p], keys[p]
+            i = p
+        heap[i], keys[i] = item, k
+        return i
 
     def build_heap(self) -> None:
-        for i in range(self.heap_size // 2, 0, -1):
+        for i in range((self.heap_size - 2) // self.arity, -1, -1):
             self.heapify(i)
 
     def get_heap(self) -> list[T]:
-        return self._heap[1:self.heap_size + 1]
-
-
-def heapsort(A: list[T], key: Callable = lambda x: x, reverse: bool = False) -> list[T]:
+        return self._heap[: self.heap_size]
+
+
+def heapsort(
+    A: list[T], key: Callable = lambda x: x, reverse: bool = False, in_place: bool = False, arity: int = 2
+) -> list[T]:
+    """
+    Sorts A with heapsort and returns the sorted list.
+
+    Parameters
+    ----------
+    A: list[T]
+        List of comparable elements.
+    key: Callable
+        Function used to compare elements in A. Defaults to comparing the elements themselves.
+    reverse: bool
+        Whether to sort in decreasing order or not. Defaults to False.
+    in_place: bool
+        Whether to sort A itself (and return it) instead of a copy. Defaults to False.
+    arity: int
+        Number of children per node of the heap. Defaults to 2.
+    """
     heap_type = HeapType.MIN if reverse else HeapType.MAX
-    H = Heap(A, heap_type, key)
-    sorted_array = []
+    H = Heap(A, heap_type, key, in_place, arity)
 
-    for _ in range(len(A)):
-        H._heap[1], H._heap[H.heap_size] = H._heap[H.heap_size], H._heap[1]
-        sorted_array.append(H._heap[H.heap_size])
+    for end in range(len(A) - 1, 0, -1):
+        H._swap(0, end)  # The max/min goes right after the heap: the array ends up sorted
         H.heap_size -= 1
-        H.heapify(1)
-
-    sorted_array.reverse()  # because we extract max/min and append to the end
-    return sorted_array
+        H.heapify(0)
+
+    return H._heap
+
+
+def iter_sorted(A: list[T], key: Callable = lambda x: x, reverse: bool = False):
+    """
+    Yields the elements of A in sorted order, lazily: the heap is built in O(n) and each element
+    costs one O(log n) extraction, so consuming only the first k elements costs O(n + k log n).
+    A is not modified.
+
+    Parameters
+    ----------
+    A: list[T]
+        List of comparable elements.
+    key: Callable
+        Function used to compare elements in A. Defaults to comparing the elements themselves.
+    reverse: bool
+        Whether to yield in decreasing order or not. Defaults to False.
+    """
+    H = Heap(A, HeapType.MAX if reverse else HeapType.MIN, key)
+
+    while H.heap_size > 0:
+        yield H._heap[0]
+        H.heap_size -= 1
+        H._swap(0, H.heap_size)
+        H.heapify(0)
 
 
 if __name__ == "__main__":
@@ -103,3 +189,8 @@ if __name__ == "__main__":
     print(C)
     C = heapsort(B, key=lambda x: x[1])
     print(C)
+    heapsort(B, in_place=True)
+    print(B)
+
+    I = iter_sorted(list(range(1_000_000, 0, -1)))
+    print([next(I) for _ in range(5)])
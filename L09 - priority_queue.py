@@ -1,38 +1,475 @@
+import asyncio
+import threading
+from collections import deque
+from operator import gt, lt
+from queue import Empty, Full
+from time import monotonic
+
 from heapsort import *
 
 
 class PriorityQueue(Heap):
+    """
+    Priority queue of (id, ...) tuples on top of Heap. A position index (id -> slot in the heap)
+    is kept up to date on every move, so upsert, decrease_key, increase_key and remove run in
+    O(log n) and contains in O(1). Ids (e[0]) must be hashable and unique: repeated ids in A raise
+    ValueError.
+    """
+
+    def __init__(self, A, queueType, key, arity=2):
+        self._pos = {}
+        super().__init__(A=A, heapType=queueType, key=key, arity=arity)
+        self._pos = {e[0]: i for i, e in enumerate(self._heap)}
+        if len(self._pos) != self.heap_size:
+            raise ValueError("Hay ids repetidos: usa upsert para actualizarlos")
+
+    def __contains__(self, id) -> bool:
+        return id in self._pos
+
+    def contains(self, id) -> bool:
+        return id in self._pos
+
+    def _swap(self, i, j) -> None:
+        super()._swap(i, j)
+        self._pos[self._heap[i][0]] = i
+        self._pos[self._heap[j][0]] = j
 
-    def __init__(self, A, queueType, key):
-        super().__init__(A=A, heapType=queueType, key=key)
+    def heapify(self, i) -> None:
+        # Igual que Heap.heapify pero actualizando la posición de cada elemento que se mueve
+        heap, keys, before, size, pos, d = self._heap, self._keys, self._before, self.heap_size, self._pos, self.arity
+        item, k = heap[i], keys[i]
+        first = d * i + 1
+        while first < size:
+            child = first
+            for c in range(first + 1, min(first + d, size)):
+                if before(keys[c], keys[child]):
+                    child = c
+            if not before(keys[child], k):
+                break
+            heap[i], keys[i] = heap[child], keys[child]
+            pos[heap[i][0]] = i
+            i = child
+            first = d * i + 1
+        heap[i], keys[i] = item, k
+        pos[item[0]] = i
+
+    def sift_up(self, i) -> int:
+        heap, keys, before, pos, d = self._heap, self._keys, self._before, self._pos, self.arity
+        item, k = heap[i], keys[i]
+        while i > 0:
+            p = (i - 1) // d
+            if not before(k, keys[p]):
+                break
+            heap[i], keys[i] = heap[p], keys[p]
+            pos[heap[i][0]] = i
+            i = p
+        heap[i], keys[i] = item, k
+        pos[item[0]] = i
+        return i
+
+    def _fix(self, i) -> None:
+        # Restaura la propiedad de heap tras cambiar la clave en i (sube o baja según haga falta)
+        if self.sift_up(i) == i:
+            self.heapify(i)
 
     def extremum(self):
         # Devuelve el elemento en la cima del heap
-        return self._heap[1] if self.heap_size >= 1 else None
+        return self._heap[0] if self.heap_size >= 1 else None
 
     def extract_extremum(self):
         # Extrae y devuelve el elemento extremo (mínimo o máximo)
         if self.heap_size < 1:
             return None
-        extreme = self._heap[1]
-        self._heap[1], self._heap[self.heap_size] = self._heap[self.heap_size], self._heap[1]
+        extreme = self._heap[0]
         self.heap_size -= 1
-        self.heapify(1)
+        self._swap(0, self.heap_size)
+        del self._pos[extreme[0]]
+        if self.heap_size > 0:
+            self.heapify(0)
         return extreme
 
     def upsert(self, e):
         # Inserta un nuevo elemento o actualiza uno existente
-        for i in range(1, self.heap_size + 1):
-            if self._heap[i][0] == e[0]:
-                self._heap[i] = e
-                self.build_heap()
-                return
+        i = self._pos.get(e[0])
+        if i is not None:
+            self._heap[i] = e
+            self._keys[i] = self._key(e)
+            self._fix(i)
+            return
+        # Extracted elements stay past heap_size; drop them so the new one lands at heap_size
+        del self._heap[self.heap_size:]
+        del self._keys[self.heap_size:]
         self._heap.append(e)
+        self._keys.append(self._key(e))
         self.heap_size += 1
-        i = self.heap_size
-        while i > 1 and not self._compare_eq(self._heap[parent(i)], self._heap[i]):
-            self._heap[i], self._heap[parent(i)] = self._heap[parent(i)], self._heap[i]
-            i = parent(i)
+        self.sift_up(self.heap_size - 1)
+
+    def _change_key(self, e, smaller: bool):
+        i = self._pos.get(e[0])
+        if i is None:
+            raise KeyError(e[0])
+        new_key = self._key(e)
+        if (new_key > self._keys[i]) if smaller else (new_key < self._keys[i]):
+            raise ValueError(f"La nueva clave es {'mayor' if smaller else 'menor'} que la actual")
+        self._heap[i] = e
+        self._keys[i] = new_key
+        self._fix(i)
+
+    def decrease_key(self, e) -> None:
+        # Reemplaza el elemento con id e[0] por e, cuya clave no puede ser mayor que la actual
+        self._change_key(e, smaller=True)
+
+    def increase_key(self, e) -> None:
+        # Reemplaza el elemento con id e[0] por e, cuya clave no puede ser menor que la actual
+        self._change_key(e, smaller=False)
+
+    def remove(self, id):
+        # Elimina y devuelve el elemento con ese id
+        i = self._pos.pop(id)
+        removed = self._heap[i]
+        self.heap_size -= 1
+        last = self.heap_size
+        if i != last:
+            self._heap[i], self._keys[i] = self._heap[last], self._keys[last]
+            self._heap[last], self._keys[last] = removed, None
+            self._pos[self._heap[i][0]] = i
+            self._fix(i)
+        return removed
+
+
+class PairingNode:
+    __slots__ = ("item", "key", "child", "sibling", "prev")
+
+    def __init__(self, item, key) -> None:
+        self.item = item
+        self.key = key
+        self.child = None  # Primer hijo
+        self.sibling = None  # Siguiente hermano
+        self.prev = None  # Hermano anterior, o el padre si es el primer hijo
+
+
+class PairingHeap:
+    """
+    Meldable priority queue of (id, ...) tuples with the same extremum / extract_extremum /
+    upsert API as PriorityQueue, backed by a pairing heap: O(1) insert, amortised O(log n)
+    extract_extremum, remove and key updates.
+
+    meld links the two trees in O(1), but the id index of the smaller queue has to be checked
+    against and moved into the larger one, so meld costs O(min(n, m)) overall. Ids must be
+    unique across the two queues.
+    """
+
+    def __init__(self, A=(), queueType=HeapType.MIN, key=lambda x: x) -> None:
+        self._key = key
+        self.type = queueType
+        self._before = gt if queueType == HeapType.MAX else lt
+        self._root = None
+        self._nodes = {}
+        for e in A:
+            self.upsert(e)
+
+    @property
+    def heap_size(self) -> int:
+        return len(self._nodes)
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, id) -> bool:
+        return id in self._nodes
+
+    def __repr__(self) -> str:
+        # Elementos en preorden del árbol
+        items, stack = [], [self._root] if self._root else []
+        while stack:
+            node = stack.pop()
+            items.append(node.item)
+            if node.sibling:
+                stack.append(node.sibling)
+            if node.child:
+                stack.append(node.child)
+        return str(items)
+
+    def _link(self, a, b):
+        # Une dos raíces: la de menor prioridad pasa a ser el primer hijo de la otra
+        if self._before(b.key, a.key):
+            a, b = b, a
+        b.prev = a
+        b.sibling = a.child
+        if a.child:
+            a.child.prev = b
+        a.child = b
+        a.sibling = a.prev = None
+        return a
+
+    def _cut(self, node) -> None:
+        # Separa el subárbol de node de su padre y hermanos
+        if node.prev.child is node:
+            node.prev.child = node.sibling
+        else:
+            node.prev.sibling = node.sibling
+        if node.sibling:
+            node.sibling.prev = node.prev
+        node.prev = node.sibling = None
+
+    def _merge_pairs(self, first):
+        # Combinación en dos pasadas: por parejas de izquierda a derecha y luego de derecha a izquierda
+        pairs = []
+        while first:
+            a, b = first, first.sibling
+            if b is None:
+                a.prev = None
+                pairs.append(a)
+                break
+            first = b.sibling
+            a.sibling = b.sibling = None
+            pairs.append(self._link(a, b))
+        root = pairs.pop() if pairs else None
+        while pairs:
+            root = self._link(pairs.pop(), root)
+        return root
+
+    def extremum(self):
+        return self._root.item if self._root else None
+
+    def extract_extremum(self):
+        if self._root is None:
+            return None
+        root = self._root
+        self._root = self._merge_pairs(root.child)
+        del self._nodes[root.item[0]]
+        return root.item
+
+    def upsert(self, e) -> None:
+        node = self._nodes.get(e[0])
+        new_key = self._key(e)
+        if node is None:
+            node = self._nodes[e[0]] = PairingNode(e, new_key)
+            self._root = self._link(self._root, node) if self._root else node
+            return
+        improves = not self._before(node.key, new_key)
+        node.item, node.key = e, new_key
+        if node is self._root:
+            if not improves:  # La raíz empeora: se reinsertan sus hijos
+                self._root = None
+                children, node.child = node.child, None
+                rest = self._merge_pairs(children)
+                self._root = self._link(rest, node) if rest else node
+            return
+        self._cut(node)
+        if not improves:
+            children, node.child = node.child, None
+            rest = self._merge_pairs(children)
+            if rest:
+                self._root = self._link(self._root, rest)
+        self._root = self._link(self._root, node)
+
+    def remove(self, id):
+        node = self._nodes.pop(id)
+        if node is self._root:
+            self._root = self._merge_pairs(node.child)
+        else:
+            self._cut(node)
+            rest = self._merge_pairs(node.child)
+            if rest:
+                self._root = self._link(self._root, rest)
+        node.child = None
+        return node.item
+
+    def meld(self, other: "PairingHeap") -> None:
+        # Absorbe todos los elementos de other, que queda vacío. Lanza ValueError si comparten algún id
+        if other.type != self.type:
+            raise ValueError("Solo se pueden unir colas del mismo tipo")
+        if other._root is None:
+            return
+        small, large = sorted((self._nodes, other._nodes), key=len)
+        if not small.keys().isdisjoint(large):
+            raise ValueError("Las colas comparten ids: usa upsert para actualizarlos")
+        large.update(small)
+        self._nodes = large
+        self._root = self._link(self._root, other._root) if self._root else other._root
+        other._root = None
+        other._nodes = {}
+
+
+class ConcurrentPriorityQueue:
+    """
+    Thread-safe front-end over PriorityQueue. get blocks while the queue is empty and put blocks
+    while it holds maxsize elements (maxsize <= 0 means unbounded); both accept a timeout and
+    raise queue.Empty / queue.Full like the standard library queues. Updating an id that is
+    already queued never blocks. put_many and get_many take the lock once per batch.
+    """
+
+    def __init__(self, A=(), queueType=HeapType.MIN, key=lambda x: x, maxsize: int = 0, arity: int = 2) -> None:
+        self._pq = PriorityQueue(list(A), queueType, key, arity)
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._pq.heap_size
+
+    def qsize(self) -> int:
+        return len(self)
+
+    def empty(self) -> bool:
+        return len(self) == 0
+
+    def full(self) -> bool:
+        with self._lock:
+            return self._is_full()
+
+    def _is_full(self) -> bool:
+        return 0 < self.maxsize <= self._pq.heap_size
+
+    def _wait(self, cond, ready, block: bool, timeout, exc) -> None:
+        # Espera (con el lock tomado) hasta que ready() se cumpla; lanza exc si no se puede esperar más
+        if ready():
+            return
+        if not block or not cond.wait_for(ready, timeout):
+            raise exc
+
+    def put(self, e, block: bool = True, timeout: float = None) -> None:
+        with self._not_full:
+            self._wait(self._not_full, lambda: e[0] in self._pq or not self._is_full(), block, timeout, Full)
+            self._pq.upsert(e)
+            self._not_empty.notify()
+
+    def put_many(self, items, block: bool = True, timeout: float = None) -> None:
+        deadline = None if timeout is None else monotonic() + timeout
+        with self._not_full:
+            pending = 0
+            try:
+                for e in items:
+                    if not (e[0] in self._pq or not self._is_full()):
+                        # Antes de esperar se despierta a los consumidores de lo ya insertado
+                        self._not_empty.notify(pending)
+                        pending = 0
+                        remaining = None if deadline is None else max(0.0, deadline - monotonic())
+                        self._wait(self._not_full, lambda: e[0] in self._pq or not self._is_full(), block, remaining, Full)
+                    self._pq.upsert(e)
+                    pending += 1
+            finally:
+                self._not_empty.notify(pending)
+
+    def get(self, block: bool = True, timeout: float = None):
+        with self._not_empty:
+            self._wait(self._not_empty, lambda: self._pq.heap_size > 0, block, timeout, Empty)
+            e = self._pq.extract_extremum()
+            self._not_full.notify()
+            return e
+
+    def get_many(self, n: int, block: bool = True, timeout: float = None) -> list:
+        # Espera a que haya al menos un elemento y devuelve hasta n, en orden de prioridad
+        with self._not_empty:
+            self._wait(self._not_empty, lambda: self._pq.heap_size > 0, block, timeout, Empty)
+            batch = [self._pq.extract_extremum() for _ in range(min(n, self._pq.heap_size))]
+            self._not_full.notify(len(batch))
+            return batch
+
+    def peek(self):
+        with self._lock:
+            return self._pq.extremum()
+
+    def remove(self, id):
+        with self._lock:
+            e = self._pq.remove(id)
+            self._not_full.notify()
+            return e
+
+
+class AsyncPriorityQueue:
+    """
+    asyncio front-end over PriorityQueue, for coroutines of a single event loop (it is not
+    thread-safe). get waits while the queue is empty and put while it holds maxsize elements;
+    the *_nowait variants raise asyncio.QueueEmpty / asyncio.QueueFull instead. Waiters are
+    futures woken one at a time, as in asyncio.Queue; use asyncio.wait_for for timeouts.
+    """
+
+    def __init__(self, A=(), queueType=HeapType.MIN, key=lambda x: x, maxsize: int = 0, arity: int = 2) -> None:
+        self._pq = PriorityQueue(list(A), queueType, key, arity)
+        self.maxsize = maxsize
+        self._getters = deque()
+        self._putters = deque()
+
+    def __len__(self) -> int:
+        return self._pq.heap_size
+
+    def qsize(self) -> int:
+        return self._pq.heap_size
+
+    def empty(self) -> bool:
+        return self._pq.heap_size == 0
+
+    def full(self) -> bool:
+        return 0 < self.maxsize <= self._pq.heap_size
+
+    def _can_put(self, e) -> bool:
+        return e[0] in self._pq or not self.full()
+
+    def _wakeup_next(self, waiters, n: int = 1) -> None:
+        while n > 0 and waiters:
+            waiter = waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                n -= 1
+
+    async def _wait(self, waiters, ready) -> None:
+        while not ready():
+            waiter = asyncio.get_running_loop().create_future()
+            waiters.append(waiter)
+            try:
+                await waiter
+            except BaseException:
+                waiter.cancel()
+                try:
+                    waiters.remove(waiter)
+                except ValueError:
+                    pass
+                # Si ya había sido despertado, el turno pasa al siguiente
+                if ready() and not waiter.cancelled():
+                    self._wakeup_next(waiters)
+                raise
+
+    def put_nowait(self, e) -> None:
+        if not self._can_put(e):
+            raise asyncio.QueueFull
+        self._pq.upsert(e)
+        self._wakeup_next(self._getters)
+
+    def get_nowait(self):
+        if self.empty():
+            raise asyncio.QueueEmpty
+        e = self._pq.extract_extremum()
+        self._wakeup_next(self._putters)
+        return e
+
+    async def put(self, e) -> None:
+        await self._wait(self._putters, lambda: self._can_put(e))
+        self.put_nowait(e)
+
+    async def put_many(self, items) -> None:
+        # Solo se suspende cuando la cola está llena
+        for e in items:
+            if not self._can_put(e):
+                await self._wait(self._putters, lambda: self._can_put(e))
+            self.put_nowait(e)
+
+    async def get(self):
+        await self._wait(self._getters, lambda: not self.empty())
+        return self.get_nowait()
+
+    async def get_many(self, n: int) -> list:
+        # Espera a que haya al menos un elemento y devuelve hasta n, en orden de prioridad
+        await self._wait(self._getters, lambda: not self.empty())
+        batch = [self._pq.extract_extremum() for _ in range(min(n, self._pq.heap_size))]
+        self._wakeup_next(self._putters, len(batch))
+        return batch
+
+    def peek(self):
+        return self._pq.extremum()
 
 
 if __name__ == "__main__":
@@ -66,3 +503,21 @@ if __name__ == "__main__":
     pq.upsert(("@", 12))
     print(pq)
     # [('BB', 14), ('@', 12), ('A', 10), ('a', 4), ('X', 8), ('d', 9), ('1', 3), ('Z', 2), ('b', 1), ('-', 7)]
+    pq.decrease_key(("BB", 1))
+    print(pq)
+    # [('@', 12), ('X', 8), ('A', 10), ('a', 4), ('-', 7), ('d', 9), ('1', 3), ('Z', 2), ('b', 1), ('BB', 1)]
+    print(pq.remove("A"))
+    # ('A', 10)
+    print("A" in pq, pq.contains("X"))
+    # False True
+
+    ph = PairingHeap(A, HeapType.MAX, key=lambda x: x[1])
+    other = PairingHeap([("Q", 20), ("R", 0)], HeapType.MAX, key=lambda x: x[1])
+    ph.meld(other)
+    print(ph.extract_extremum(), ph.extremum(), len(ph), len(other))
+    # ('Q', 20) ('@', 16) 11 0
+
+    cpq = ConcurrentPriorityQueue(queueType=HeapType.MAX, key=lambda x: x[1], maxsize=4)
+    cpq.put_many(A[:4])
+    print(cpq.get_many(2))
+    # [('a', 4), ('1', 3)]
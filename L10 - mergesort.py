@@ -1,31 +1,184 @@
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from heapq import merge
+from multiprocessing.shared_memory import SharedMemory
 from typing import TypeVar, Callable
+from operator import ge, gt, le, lt
+
+from lessons import is_ndarray, load_module, np
 
 T = TypeVar("T")
 
 
-def merge_sort(A: list[T], key: Callable = lambda x: x, reverse: bool = False) -> None:
+def find_runs(A: list[T], keys: list, reverse: bool = False) -> list[int]:
+    """
+    Splits A into maximal natural runs and returns their boundaries [0, r1, r2, ..., n].
+
+    Runs already in order (non-decreasing, or non-increasing if reverse) are kept; runs strictly in
+    the opposite order are reversed in place together with their keys. Only strict runs are
+    reversed, so equal keys never swap places and the sort stays stable.
+    """
+    in_order, against = (ge, gt) if reverse else (le, lt)
+    n = len(A)
+    bounds = [0]
+    lo = 0
+
+    while lo < n:
+        hi = lo + 1
+        if hi < n and against(keys[hi], keys[lo]):
+            while hi < n and against(keys[hi], keys[hi - 1]):
+                hi += 1
+            A[lo:hi] = A[lo:hi][::-1]
+            keys[lo:hi] = keys[lo:hi][::-1]
+        else:
+            while hi < n and in_order(keys[hi - 1], keys[hi]):
+                hi += 1
+        bounds.append(hi)
+        lo = hi
+    return bounds
+
+
+def merge_into(src, src_keys, dst, dst_keys, lo, mid, hi, reverse: bool = False) -> None:
+    """
+    Stable merge of the sorted runs src[lo:mid] and src[mid:hi] into dst[lo:hi] (keys move along).
+
+    On ties the element of the left run goes first, both for ascending and for reverse order.
+    """
+    in_order = ge if reverse else le
+    if in_order(src_keys[mid - 1], src_keys[mid]):  # Los tramos ya están en orden: copia lineal
+        dst[lo:hi] = src[lo:hi]
+        dst_keys[lo:hi] = src_keys[lo:hi]
+        return
+
+    i, j, k = lo, mid, lo
+    while i < mid and j < hi:
+        if in_order(src_keys[i], src_keys[j]):
+            dst[k] = src[i]
+            dst_keys[k] = src_keys[i]
+            i += 1
+        else:
+            dst[k] = src[j]
+            dst_keys[k] = src_keys[j]
+            j += 1
+        k += 1
+
+    if i < mid:
+        dst[k:hi] = src[i:mid]
+        dst_keys[k:hi] = src_keys[i:mid]
+    else:
+        dst[k:hi] = src[j:hi]
+        dst_keys[k:hi] = src_keys[j:hi]
+
+
+def natural_merge_sort(A: list[T], key: Callable = lambda x: x, reverse: bool = False) -> None:
+    """
+    Sorts (in place) list A using an iterative, bottom-up natural merge sort.
+
+    Natural runs are detected first and merged pairwise, ping-ponging between A and a single
+    auxiliary buffer allocated once, so presorted input costs O(n) and no per-merge slices are
+    created. Stable for both ascending and reverse order.
+
+    Parameters
+    ----------
+    A: list[T]
+        List of comparable elements.
+    key: Callable
+        Function used to compare elements in A. Defaults to comparing the elements themselves.
+    reverse: bool
+        Whether to sort in decreasing order or not. Defaults to False.
+    """
+    n = len(A)
+    keys = [key(x) for x in A]
+    bounds = find_runs(A, keys, reverse)
+    if len(bounds) <= 2:
+        return
+
+    src, src_keys = A, keys
+    dst, dst_keys = [None] * n, [None] * n
+
+    while len(bounds) > 2:
+        merged = [0]
+        for t in range(0, len(bounds) - 1, 2):
+            lo, mid = bounds[t], bounds[t + 1]
+            if t + 2 < len(bounds):
+                hi = bounds[t + 2]
+                merge_into(src, src_keys, dst, dst_keys, lo, mid, hi, reverse)
+            else:  # Tramo impar al final: se copia tal cual
+                hi = mid
+                dst[lo:hi] = src[lo:hi]
+                dst_keys[lo:hi] = src_keys[lo:hi]
+            merged.append(hi)
+        bounds = merged
+        src, src_keys, dst, dst_keys = dst, dst_keys, src, src_keys
+
+    if src is not A:
+        A[:] = src
+
+
+def _argsort(keys, reverse: bool = False):
+    # Stable sorting permutation of a NumPy array of keys, also for reverse order
+    if not reverse:
+        return np.argsort(keys, kind="stable")
+    return len(keys) - 1 - np.argsort(keys[::-1], kind="stable")[::-1]
+
+
+def _array_keys(A, key):
+    # Keys of the elements of a NumPy array. A vectorised key (key(A) returns an array with one key
+    # per element) is used as is; any other key is applied to each element, as for lists
+    if A.ndim == 1:
+        try:
+            keys = key(A)
+        except (TypeError, ValueError):
+            keys = None
+        if is_ndarray(keys) and keys.shape == A.shape:
+            return keys
+    return [key(x) for x in A]
+
+
+def merge_sort(A: list[T], key: Callable = lambda x: x, reverse: bool = False, bottom_up: bool = False) -> None:
+    if is_ndarray(A):
+        # Arrays are sorted in place through a permutation, so they stay arrays whatever the key
+        keys = _array_keys(A, key)
+        if is_ndarray(keys):
+            order = _argsort(keys, reverse)
+        else:
+            order = list(range(len(A)))
+            natural_merge_sort(order, keys.__getitem__, reverse)
+        A[:] = A[order]
+        return
+    if bottom_up:
+        return natural_merge_sort(A, key, reverse)
+    keys = [key(x) for x in A]  # Cada clave se calcula una sola vez y se mueve junto a su elemento
+
     def merge(A, p, q, r):
         L = A[p:q + 1]
         R = A[q + 1:r + 1]
+        LK = keys[p:q + 1]
+        RK = keys[q + 1:r + 1]
         i = j = 0
         k = p
 
         while i < len(L) and j < len(R):
-            if key(L[i]) <= key(R[j]):
+            if LK[i] <= RK[j]:
                 A[k] = L[i]
+                keys[k] = LK[i]
                 i += 1
             else:
                 A[k] = R[j]
+                keys[k] = RK[j]
                 j += 1
             k += 1
 
         while i < len(L):
             A[k] = L[i]
+            keys[k] = LK[i]
             i += 1
             k += 1
 
         while j < len(R):
             A[k] = R[j]
+            keys[k] = RK[j]
             j += 1
             k += 1
 
@@ -41,6 +194,122 @@ def merge_sort(A: list[T], key: Callable = lambda x: x, reverse: bool = False) -
         A.reverse()
 
 
+def _shared_typecode(keys: list):
+    # Typecode of an array that holds every key exactly, or None if the keys aren't plain numbers
+    if all(type(k) is int for k in keys):
+        if all(-(2**63) <= k < 2**63 for k in keys):
+            return "q"
+        return None
+    if all(type(k) is float or (type(k) is int and -(2**53) <= k <= 2**53) for k in keys):
+        return "d"
+    return None
+
+
+def _sort_chunk(keys: list, reverse: bool) -> list[int]:
+    # Worker: returns the stable sorting permutation of a chunk of keys
+    order = list(range(len(keys)))
+    natural_merge_sort(order, key=keys.__getitem__, reverse=reverse)
+    return order
+
+
+def _sort_chunk_shared(keys_name: str, order_name: str, typecode: str, lo: int, hi: int, reverse: bool) -> None:
+    # Worker: sorts keys[lo:hi] of a shared buffer and writes the permutation into another one
+    keys_shm = SharedMemory(keys_name)
+    order_shm = SharedMemory(order_name)
+    keys = keys_shm.buf.cast(typecode)
+    order = order_shm.buf.cast("q")
+    try:
+        chunk = list(range(lo, hi))
+        natural_merge_sort(chunk, key=keys.__getitem__, reverse=reverse)
+        order[lo:hi] = array("q", chunk)
+    finally:
+        keys.release()
+        order.release()
+        keys_shm.close()
+        order_shm.close()
+
+
+def _executor(workers: int) -> ProcessPoolExecutor:
+    if __name__ == "__main__":  # multiprocessing already re-runs the main script in the children
+        return ProcessPoolExecutor(max_workers=workers)
+    # With spawn or forkserver the children start a fresh interpreter, and when this file was loaded
+    # by path (see L25) its module name can't be imported there, so each worker loads it again first
+    return ProcessPoolExecutor(
+        max_workers=workers, initializer=load_module, initargs=(os.path.abspath(__file__), __name__)
+    )
+
+
+def parallel_merge_sort(
+    A: list[T], key: Callable = lambda x: x, reverse: bool = False, workers: int = None
+) -> None:
+    """
+    Sorts (in place) list A by sorting chunks in parallel processes and k-way merging the results.
+
+    Keys are computed once in this process; only keys travel to the workers, which return the
+    stable sorting permutation of their chunk. When every key is an int (64 bits) or a float, keys
+    and permutations live in shared memory and nothing is pickled. Stable.
+
+    Parameters
+    ----------
+    A: list[T]
+        List of comparable elements.
+    key: Callable
+        Function used to compare elements in A. Defaults to comparing the elements themselves.
+    reverse: bool
+        Whether to sort in decreasing order or not. Defaults to False.
+    workers: int
+        Number of worker processes. Defaults to os.cpu_count(). With 1 worker A is sorted
+        sequentially with natural_merge_sort.
+
+    Works with every multiprocessing start method. Under spawn and forkserver (the defaults on
+    Windows, macOS and, from Python 3.14, Linux) each worker starts a new interpreter and
+    re-executes this file before its first chunk, which adds a fixed start-up cost per call.
+    """
+    n = len(A)
+    workers = min(workers or os.cpu_count() or 1, n)
+    if workers <= 1:
+        return natural_merge_sort(A, key, reverse)
+
+    keys = [key(x) for x in A]
+    bounds = [n * w // workers for w in range(workers + 1)]
+    typecode = _shared_typecode(keys)
+
+    with _executor(workers) as executor:
+        if typecode is None:
+            futures = [
+                executor.submit(_sort_chunk, keys[lo:hi], reverse) for lo, hi in zip(bounds, bounds[1:])
+            ]
+            runs = [[lo + i for i in f.result()] for lo, f in zip(bounds, futures)]
+            order = merge(*runs, key=keys.__getitem__, reverse=reverse)
+            A[:] = [A[i] for i in order]
+            return
+
+        keys_shm = SharedMemory(create=True, size=n * 8)
+        order_shm = SharedMemory(create=True, size=n * 8)
+        shared_keys = keys_shm.buf.cast(typecode)
+        shared_order = order_shm.buf.cast("q")
+        try:
+            shared_keys[:] = array(typecode, keys)
+            futures = [
+                executor.submit(_sort_chunk_shared, keys_shm.name, order_shm.name, typecode, lo, hi, reverse)
+                for lo, hi in zip(bounds, bounds[1:])
+            ]
+            for f in futures:
+                f.result()
+            # heapq.merge is stable: on ties the earlier chunk goes first
+            runs = [shared_order[lo:hi] for lo, hi in zip(bounds, bounds[1:])]
+            A[:] = [A[i] for i in merge(*runs, key=keys.__getitem__, reverse=reverse)]
+            for run in runs:
+                run.release()
+        finally:
+            shared_keys.release()
+            shared_order.release()
+            keys_shm.close()
+            order_shm.close()
+            keys_shm.unlink()
+            order_shm.unlink()
+
+
 if __name__ == "__main__":
 
     A = [3, 2, 5, 1, 9, 0, 8, 6, 7, 4]
@@ -53,6 +322,7 @@ if __name__ == "__main__":
     # [9, 8, 7, 6, 5, 4, 3, 2, 1, 0]
 
     B = [(3, 8), (2, 0), (5, 5), (1, 6), (9, 3), (0, 2), (8, 1), (6, 4), (7, 9), (4, 7)]
+    C = list(B)
     merge_sort(B)
     print(B)
     # [(0, 2), (1, 6), (2, 0), (3, 8), (4, 7), (5, 5), (6, 4), (7, 9), (8, 1), (9, 3)]
@@ -60,3 +330,12 @@ if __name__ == "__main__":
     merge_sort(B, key=lambda x: x[1])
     print(B)
     # [(2, 0), (8, 1), (0, 2), (9, 3), (6, 4), (5, 5), (1, 6), (4, 7), (3, 8), (7, 9)]
+
+    merge_sort(C, key=lambda x: x[0] // 3, reverse=True, bottom_up=True)
+    print(C)
+    # [(9, 3), (8, 1), (6, 4), (7, 9), (3, 8), (5, 5), (4, 7), (2, 0), (1, 6), (0, 2)]
+
+    D = [(3, 8), (2, 0), (5, 5), (1, 6), (9, 3), (0, 2), (8, 1), (6, 4), (7, 9), (4, 7)]
+    parallel_merge_sort(D, key=lambda x: x[1], workers=2)
+    print(D)
+    # [(2, 0), (8, 1), (0, 2), (9, 3), (6, 4), (5, 5), (1, 6), (4, 7), (3, 8), (7, 9)]
@@ -1,23 +1,181 @@
-from typing import TypeVar, Callable
+from typing import TypeVar, Callable, Iterable
+from heapq import nlargest, nsmallest
+from math import log2
+
+from lessons import is_ndarray, load_module, np
 
 T = TypeVar("T")
 
+INSERTION_CUTOFF = 16  # Tramos de este tamaño o menores se ordenan con insertion sort
+NINTHER_THRESHOLD = 40  # A partir de este tamaño el pivote es la mediana de tres medianas
+
 
-def partition(A: list[T], p: int, r: int, key: Callable) -> int:
-    pivot = A[r]
+def partition(A: list[T], p: int, r: int, key: Callable, keys: list = None) -> int:
+    # keys: claves ya calculadas de A (keys[i] == key(A[i])), que se permutan junto con A
+    if keys is None:
+        keys = [key(x) for x in A[p:r + 1]]
+        offset = p
+    else:
+        offset = 0
+    pivot = keys[r - offset]
     i = p - 1
     for j in range(p, r):
-        if key(A[j]) <= key(pivot):
+        if keys[j - offset] <= pivot:
             i += 1
             A[i], A[j] = A[j], A[i]
+            keys[i - offset], keys[j - offset] = keys[j - offset], keys[i - offset]
     A[i + 1], A[r] = A[r], A[i + 1]
+    keys[i + 1 - offset], keys[r - offset] = keys[r - offset], keys[i + 1 - offset]
     return i + 1
 
 
-def quick_sort(A: list[T], key: Callable = lambda x: x, reverse: bool = False) -> None:
+def _swap(A, keys, i, j):
+    A[i], A[j] = A[j], A[i]
+    keys[i], keys[j] = keys[j], keys[i]
+
+
+def _insertion_sort_range(A, keys, lo, hi):
+    # Ordena A[lo:hi] por inserción usando las claves ya calculadas
+    for i in range(lo + 1, hi):
+        current, current_key = A[i], keys[i]
+        j = i - 1
+        while j >= lo and keys[j] > current_key:
+            A[j + 1] = A[j]
+            keys[j + 1] = keys[j]
+            j -= 1
+        A[j + 1] = current
+        keys[j + 1] = current_key
+
+
+def _median_of_three(keys, a, b, c) -> int:
+    # Devuelve el índice (a, b o c) cuya clave es la mediana de las tres
+    if keys[a] < keys[b]:
+        if keys[b] < keys[c]:
+            return b
+        return c if keys[a] < keys[c] else a
+    if keys[a] < keys[c]:
+        return a
+    return c if keys[b] < keys[c] else b
+
+
+def _choose_pivot(keys, lo, hi) -> int:
+    n = hi - lo
+    mid = lo + n // 2
+    if n < NINTHER_THRESHOLD:
+        return _median_of_three(keys, lo, mid, hi - 1)
+    s = n // 8  # Ninther de Tukey: mediana de las medianas de tres ternas
+    return _median_of_three(
+        keys,
+        _median_of_three(keys, lo, lo + s, lo + 2 * s),
+        _median_of_three(keys, mid - s, mid, mid + s),
+        _median_of_three(keys, hi - 1 - 2 * s, hi - 1 - s, hi - 1),
+    )
+
+
+def _median_of_medians(A, keys, lo, hi) -> int:
+    """
+    Returns the index of the median of the medians of groups of 5 of A[lo:hi] (BFPRT pivot).
+    At least 30% of the range is guaranteed to lie on each side of it.
+    """
+    medians = []
+    for g in range(lo, hi, 5):
+        group = sorted(range(g, min(g + 5, hi)), key=keys.__getitem__)
+        medians.append(group[len(group) // 2])
+    if len(medians) <= 5:
+        return sorted(medians, key=keys.__getitem__)[len(medians) // 2]
+    # Se selecciona la mediana de las medianas sobre listas auxiliares (índices y sus claves)
+    positions = list(medians)
+    median_keys = [keys[j] for j in medians]
+    m = len(positions) // 2
+    _introselect(positions, median_keys, 0, len(positions), m)
+    return positions[m]
+
+
+def _partition_3way(A, keys, lo, hi, pivot_index: int = None) -> tuple[int, int]:
+    """
+    Dutch national flag partition of A[lo:hi] around a median-of-three / ninther pivot
+    (or around A[pivot_index] if given).
+
+    Returns (lt, gt) so that keys in A[lo:lt] are smaller than the pivot, keys in A[lt:gt + 1]
+    are equal to it and keys in A[gt + 1:hi] are greater.
+    """
+    if pivot_index is None:
+        pivot_index = _choose_pivot(keys, lo, hi)
+    _swap(A, keys, lo, pivot_index)
+    pivot = keys[lo]
+    lt, i, gt = lo, lo + 1, hi - 1
+    while i <= gt:
+        if keys[i] < pivot:
+            _swap(A, keys, lt, i)
+            lt += 1
+            i += 1
+        elif keys[i] > pivot:
+            _swap(A, keys, i, gt)
+            gt -= 1
+        else:
+            i += 1
+    return lt, gt
+
+
+def _heapsort_range(A, keys, lo, hi):
+    heapsort = load_module("L08 - heapsort.py").heapsort  # Only needed when introsort falls back
+
+    pairs = heapsort(list(zip(keys[lo:hi], A[lo:hi])), key=lambda pair: pair[0])
+    keys[lo:hi] = [k for k, _ in pairs]
+    A[lo:hi] = [e for _, e in pairs]
+
+
+def intro_sort(A: list[T], key: Callable = lambda x: x, reverse: bool = False) -> None:
+    """
+    Sorts (in place) list A using introsort: an iterative quicksort with median-of-three / ninther
+    pivots and 3-way partitioning that falls back to heapsort when the partitions degenerate
+    (depth above 2·log2 n) and finishes small ranges with insertion sort. O(n log n) worst case.
+
+    Parameters
+    ----------
+    A: list[T]
+        List of comparable elements.
+    key: Callable
+        Function used to compare elements in A. Defaults to comparing the elements themselves.
+    reverse: bool
+        Whether to sort in decreasing order or not. Defaults to False.
+    """
+    n = len(A)
+    if n < 2:
+        return
+    keys = [key(x) for x in A]  # Cada clave se calcula una sola vez
+    max_depth = 2 * int(log2(n))
+    stack = [(0, n, 0)]  # Tramos [lo, hi) pendientes y su profundidad
+
+    while stack:
+        lo, hi, depth = stack.pop()
+        if hi - lo <= INSERTION_CUTOFF:
+            _insertion_sort_range(A, keys, lo, hi)
+            continue
+        if depth > max_depth:
+            _heapsort_range(A, keys, lo, hi)
+            continue
+        lt, gt = _partition_3way(A, keys, lo, hi)
+        # Se apila primero el tramo mayor para procesar antes el menor: la pila queda en O(log n)
+        if lt - lo > hi - gt - 1:
+            stack.append((lo, lt, depth + 1))
+            stack.append((gt + 1, hi, depth + 1))
+        else:
+            stack.append((gt + 1, hi, depth + 1))
+            stack.append((lo, lt, depth + 1))
+
+    if reverse:
+        A.reverse()
+
+
+def quick_sort(A: list[T], key: Callable = lambda x: x, reverse: bool = False, introsort: bool = False) -> None:
+    if introsort:
+        return intro_sort(A, key, reverse)
+    keys = [key(x) for x in A]  # Cada clave se calcula una sola vez
+
     def quicksort_rec(A, p, r):
         if p < r:
-            q = partition(A, p, r, key)
+            q = partition(A, p, r, key, keys)
             quicksort_rec(A, p, q - 1)
             quicksort_rec(A, q + 1, r)
 
@@ -26,20 +184,105 @@ def quick_sort(A: list[T], key: Callable = lambda x: x, reverse: bool = False) -
         A.reverse()
 
 
-def select(A: list[T], i: int, key: Callable = lambda x: x) -> T:
-    def select_rec(A, p, r, i):
-        if p == r:
-            return A[p]
-        q = partition(A, p, r, key)
-        k = q - p
-        if i == k:
-            return A[q]
-        elif i < k:
-            return select_rec(A, p, q - 1, i)
+def _introselect(A, keys, lo, hi, i) -> None:
+    """
+    Rearranges A[lo:hi] (and keys) so that A[i] is the element that would be there if the range
+    were sorted. Quickselect with median-of-three / ninther pivots; after 2·log2 n partitions the
+    pivot switches to the median of medians, so the worst case is O(n). Iterative.
+    """
+    budget = 2 * int(log2(max(hi - lo, 2)))
+    while hi - lo > INSERTION_CUTOFF:
+        pivot = _median_of_medians(A, keys, lo, hi) if budget <= 0 else None
+        budget -= 1
+        lt, gt = _partition_3way(A, keys, lo, hi, pivot)
+        if i < lt:
+            hi = lt
+        elif i > gt:
+            lo = gt + 1
         else:
-            return select_rec(A, q + 1, r, i - k - 1)
+            return
+    _insertion_sort_range(A, keys, lo, hi)
+
+
+def select(A: list[T], i: int, key: Callable = lambda x: x, in_place: bool = True) -> T:
+    """
+    Returns the element of rank i (0-based) of A, i.e. the one that would be A[i] if A were sorted,
+    in O(n) worst case (introselect).
 
-    return select_rec(A, 0, len(A) - 1, i)
+    Parameters
+    ----------
+    A: list[T]
+        List of comparable elements.
+    i: int
+        Rank of the element, 0 <= i < len(A).
+    key: Callable
+        Function used to compare elements in A. Defaults to comparing the elements themselves.
+    in_place: bool
+        Whether A may be rearranged (partitioned around the result). If False A is left unmodified
+        at the cost of a copy. Defaults to True.
+    """
+    if is_ndarray(A):
+        # Arrays use a vectorised key (key(A) returns the array of keys) and are not modified
+        return A[np.argpartition(key(A), i)[i]]
+    if not 0 <= i < len(A):
+        raise IndexError("El rango está fuera de la lista")
+    if not in_place:
+        A = list(A)
+    keys = [key(x) for x in A]  # Cada clave se calcula una sola vez
+    _introselect(A, keys, 0, len(A), i)
+    return A[i]
+
+
+def multiselect(A: list[T], ranks: list[int], key: Callable = lambda x: x, in_place: bool = False) -> list[T]:
+    """
+    Returns the elements of the given ranks (0-based) of A, in the same order as ranks, with a
+    single partitioning pass shared by all ranks: each partition only descends into the sides that
+    still contain requested ranks. O(n log m) for m distinct ranks.
+
+    Parameters
+    ----------
+    A: list[T]
+        List of comparable elements.
+    ranks: list[int]
+        Ranks to find, e.g. [len(A) * p // 100 for p in (50, 95, 99)] for percentiles.
+    key: Callable
+        Function used to compare elements in A. Defaults to comparing the elements themselves.
+    in_place: bool
+        Whether A may be rearranged. Defaults to False (A is copied and left unmodified).
+    """
+    n = len(A)
+    if any(not 0 <= r < n for r in ranks):
+        raise IndexError("Algún rango está fuera de la lista")
+    if not in_place:
+        A = list(A)
+    keys = [key(x) for x in A]
+    budget = 2 * int(log2(max(n, 2)))
+    stack = [(0, n, sorted(set(ranks)), 0)]  # Tramo [lo, hi), rangos pendientes en él y profundidad
+
+    while stack:
+        lo, hi, pending, depth = stack.pop()
+        if hi - lo <= INSERTION_CUTOFF:
+            _insertion_sort_range(A, keys, lo, hi)
+            continue
+        pivot = _median_of_medians(A, keys, lo, hi) if depth > budget else None
+        lt, gt = _partition_3way(A, keys, lo, hi, pivot)
+        left = [r for r in pending if r < lt]
+        right = [r for r in pending if r > gt]
+        if left:
+            stack.append((lo, lt, left, depth + 1))
+        if right:
+            stack.append((gt + 1, hi, right, depth + 1))
+
+    return [A[r] for r in ranks]
+
+
+def top_k(iterable: Iterable[T], k: int, key: Callable = None, largest: bool = True) -> list[T]:
+    """
+    Returns the k largest (or smallest) elements of iterable, best first, streaming it through a
+    bounded heap of size k: O(n log k) time and O(k) memory, the input is never materialised.
+    Ties keep their input order.
+    """
+    return nlargest(k, iterable, key=key) if largest else nsmallest(k, iterable, key=key)
 
 
 if __name__ == "__main__":
@@ -62,8 +305,19 @@ if __name__ == "__main__":
     print(B)
     # [(2, 0), (8, 1), (0, 2), (9, 3), (6, 4), (5, 5), (1, 6), (4, 7), (3, 8), (7, 9)]
 
+    C = list(range(10000))  # Ya ordenada: el quicksort clásico agotaría la recursión
+    quick_sort(C, introsort=True)
+    print(C == sorted(C))
+    # True
+
     print(select(B, 4))
     # (4, 7)
 
     print(select(B, 4, key=lambda x: x[1]))
     # (6, 4)
+
+    print(multiselect(list(range(100, 0, -1)), [49, 94, 98]))
+    # [50, 95, 99]
+
+    print(top_k(iter(B), 3, key=lambda x: x[1]))
+    # [(7, 9), (3, 8), (4, 7)]
@@ -4,18 +4,21 @@ T = TypeVar("T")
 
 
 def binary_search(A: list[T], e: T, key: Callable = lambda x: x):
-    def binary_search_rec(A, p, r, e):
+    # Solo se visitan O(log n) posiciones: la clave de e se calcula una vez
+    # y la de cada posición visitada también una sola vez.
+    def binary_search_rec(A, p, r, e_key):
         if p > r:
             return -1
         mid = (p + r) // 2
-        if key(A[mid]) == key(e):
+        mid_key = key(A[mid])
+        if mid_key == e_key:
             return mid
-        elif key(A[mid]) > key(e):
-            return binary_search_rec(A, p, mid - 1, e)
+        elif mid_key > e_key:
+            return binary_search_rec(A, p, mid - 1, e_key)
         else:
-            return binary_search_rec(A, mid + 1, r, e)
+            return binary_search_rec(A, mid + 1, r, e_key)
 
-    return binary_search_rec(A, 0, len(A) - 1, e)
+    return binary_search_rec(A, 0, len(A) - 1, key(e))
 
 
 if __name__ == "__main__":
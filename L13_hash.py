@@ -1,34 +1,307 @@
+import tracemalloc
+from array import array
+from time import perf_counter
+
+MAX_LOAD = 1.0  # Se duplica la tabla al superar este factor de carga
+MIN_LOAD = 0.125  # Se reduce por debajo de este, hasta un factor de carga de al menos MAX_LOAD / 4
+REHASH_STEP = 2  # Cubetas migradas de la tabla vieja a la nueva en cada operación
+
+
 class HashTable:
     def __init__(self, size=10):
         self.size = size
-        self.table = [[] for _ in range(size)]
-    
-    def _hash(self, key):
-        return hash(key) % self.size
-    
-    def insert(self, key, value):
+        self.table = [None] * size  # Las cubetas se crean al insertar en ellas
+        self.count = 0
+        self._min_size = size
+        # Rehash incremental: mientras _old no sea None, las cubetas _old[_rehash_index:] aún no se han movido
+        self._old = None
+        self._rehash_index = 0
+        # Histograma de longitudes de cadena (_chains[l] = cubetas con l elementos, l >= 1)
+        self._chains = [0]
+        self.longest_chain = 0
+
+    def _hash(self, key, size=None):
+        return hash(key) % (size or self.size)
+
+    @property
+    def load_factor(self):
+        return self.count / self.size
+
+    @property
+    def rehashing(self):
+        return self._old is not None
+
+    def __len__(self):
+        return self.count
+
+    def _chain_resized(self, old_len, new_len):
+        # Actualiza el histograma y la cadena más larga cuando una cubeta pasa de old_len a new_len elementos
+        if old_len:
+            self._chains[old_len] -= 1
+        if new_len:
+            if new_len == len(self._chains):
+                self._chains.append(0)
+            self._chains[new_len] += 1
+        if new_len > self.longest_chain:
+            self.longest_chain = new_len
+        while self.longest_chain and not self._chains[self.longest_chain]:
+            self.longest_chain -= 1
+
+    def _rehash_step(self, steps=REHASH_STEP):
+        # Mueve hasta steps cubetas no vacías de la tabla vieja a la nueva
+        old = self._old
+        if old is None:
+            return
+        visits = 10 * steps  # Límite de cubetas vacías recorridas por operación
+        while steps and visits and self._rehash_index < len(old):
+            bucket = old[self._rehash_index]
+            old[self._rehash_index] = None
+            self._rehash_index += 1
+            visits -= 1
+            if not bucket:
+                continue
+            steps -= 1
+            self._chain_resized(len(bucket), 0)
+            for pair in bucket:
+                target = self._new_bucket(pair[0])
+                target.append(pair)
+                self._chain_resized(len(target) - 1, len(target))
+        if self._rehash_index == len(old):
+            self._old = None
+            self._maybe_resize()  # Pudo quedar pendiente otra reducción mientras se migraba
+
+    def _resize(self, new_size):
+        # Empieza a migrar a una tabla de new_size cubetas (solo se llama sin rehash pendiente)
+        self._old = self.table
+        self._rehash_index = 0
+        self.table = [None] * new_size
+        self.size = new_size
+
+    def _maybe_resize(self):
+        if self.count == 0 and (self.size > self._min_size or self._old is not None):
+            # Tabla vacía: se vuelve al tamaño inicial sin migrar nada
+            self.table = [None] * self._min_size
+            self.size = self._min_size
+            self._old = None
+            return
+        if self._old is not None:
+            return
+        if self.count > MAX_LOAD * self.size:
+            self._resize(2 * self.size)
+        elif self.size > self._min_size and self.count < MIN_LOAD * self.size:
+            # El tamaño destino se elige según count, de una vez, en lugar de reducir a la mitad cada vez
+            new_size = self.size
+            while new_size // 2 >= self._min_size and self.count <= MAX_LOAD * new_size / 4:
+                new_size //= 2
+            self._resize(new_size)
+
+    def _bucket(self, key):
+        # Cubeta donde está (o debe ir) key: la vieja si aún no se ha migrado y contiene la clave
+        if self._old is not None:
+            index = self._hash(key, len(self._old))
+            if index >= self._rehash_index:
+                bucket = self._old[index]
+                for pair in bucket or ():
+                    if pair[0] == key:
+                        return bucket
+        return self.table[self._hash(key)] or ()
+
+    def _new_bucket(self, key):
+        # Cubeta de la tabla actual para key, creándola si aún no existe
         index = self._hash(key)
-        for pair in self.table[index]:
+        bucket = self.table[index]
+        if bucket is None:
+            bucket = self.table[index] = []
+        return bucket
+
+    def insert(self, key, value):
+        self._rehash_step()
+        bucket = self._bucket(key)
+        for pair in bucket:
             if pair[0] == key:
                 pair[1] = value
                 return
-        self.table[index].append([key, value])
-    
+        bucket = self._new_bucket(key)
+        bucket.append([key, value])
+        self.count += 1
+        self._chain_resized(len(bucket) - 1, len(bucket))
+        self._maybe_resize()
+
     def get(self, key):
-        index = self._hash(key)
-        for pair in self.table[index]:
+        self._rehash_step()
+        for pair in self._bucket(key):
             if pair[0] == key:
                 return pair[1]
         return None
-    
+
     def delete(self, key):
-        index = self._hash(key)
-        for i, pair in enumerate(self.table[index]):
+        self._rehash_step()
+        bucket = self._bucket(key)
+        for i, pair in enumerate(bucket):
             if pair[0] == key:
-                del self.table[index][i]
+                del bucket[i]
+                self.count -= 1
+                self._chain_resized(len(bucket) + 1, len(bucket))
+                self._maybe_resize()
                 return True
         return False
-    
+
     def display(self):
+        if self._old is not None:
+            for i in range(self._rehash_index, len(self._old)):
+                print(f"Old index {i}: {self._old[i] or []}")
         for i, bucket in enumerate(self.table):
-            print(f"Index {i}: {bucket}")
\ No newline at end of file
+            print(f"Index {i}: {bucket or []}")
+
+
+EMPTY = -1  # hash() nunca devuelve -1, así que marca las casillas libres
+ROBIN_HOOD_MAX_LOAD = 0.75
+
+
+class RobinHoodHashTable:
+    """
+    Hash table with open addressing and Robin Hood linear probing, with the insert/get/delete
+    API of HashTable.
+
+    Hashes, keys and values live in three parallel arrays (the hashes in an array.array of
+    64-bit ints), so there is no list per bucket nor per entry. The hash of each key is
+    computed once and stored: probes compare the stored hash before calling ==, and resizing
+    doesn't hash again. On insert, an entry further from its home slot takes the place of one
+    closer to it, which keeps probe sequences short; delete shifts the following entries back
+    one slot instead of leaving tombstones.
+    """
+
+    def __init__(self, size=8):
+        capacity = 8
+        while capacity < size:
+            capacity <<= 1
+        self._allocate(capacity)
+        self.count = 0
+
+    def _allocate(self, capacity):
+        self.size = capacity
+        self._mask = capacity - 1
+        self._hashes = array("q", [EMPTY]) * capacity
+        self._keys = [None] * capacity
+        self._values = [None] * capacity
+
+    @property
+    def load_factor(self):
+        return self.count / self.size
+
+    def __len__(self):
+        return self.count
+
+    def _find(self, key, h):
+        # Casilla de key, o -1 si no está
+        hashes, keys, mask = self._hashes, self._keys, self._mask
+        i, dist = h & mask, 0
+        while True:
+            stored = hashes[i]
+            if stored == EMPTY or (i - stored) & mask < dist:  # Una clave más cercana a su casilla: key no está
+                return -1
+            if stored == h and (keys[i] is key or keys[i] == key):
+                return i
+            i = (i + 1) & mask
+            dist += 1
+
+    def _place(self, h, key, value):
+        # Inserta una clave que no está en la tabla
+        hashes, keys, values, mask = self._hashes, self._keys, self._values, self._mask
+        i, dist = h & mask, 0
+        while hashes[i] != EMPTY:
+            other = (i - hashes[i]) & mask
+            if other < dist:  # Robin Hood: la entrada más "rica" cede la casilla y sigue buscando
+                hashes[i], h = h, hashes[i]
+                keys[i], key = key, keys[i]
+                values[i], value = value, values[i]
+                dist = other
+            i = (i + 1) & mask
+            dist += 1
+        hashes[i], keys[i], values[i] = h, key, value
+
+    def _resize(self, capacity):
+        hashes, keys, values = self._hashes, self._keys, self._values
+        self._allocate(capacity)
+        for i, h in enumerate(hashes):
+            if h != EMPTY:
+                self._place(h, keys[i], values[i])
+
+    def insert(self, key, value):
+        h = hash(key)
+        if h < 0:
+            h &= (1 << 63) - 1  # Los hashes se guardan no negativos: EMPTY queda libre
+        i = self._find(key, h)
+        if i >= 0:
+            self._values[i] = value
+            return
+        if self.count + 1 > ROBIN_HOOD_MAX_LOAD * self.size:
+            self._resize(2 * self.size)
+        self._place(h, key, value)
+        self.count += 1
+
+    def get(self, key):
+        h = hash(key)
+        if h < 0:
+            h &= (1 << 63) - 1
+        i = self._find(key, h)
+        return self._values[i] if i >= 0 else None
+
+    def delete(self, key):
+        h = hash(key)
+        if h < 0:
+            h &= (1 << 63) - 1
+        i = self._find(key, h)
+        if i < 0:
+            return False
+        hashes, keys, values, mask = self._hashes, self._keys, self._values, self._mask
+        j = (i + 1) & mask
+        # Desplazamiento hacia atrás: las entradas siguientes que no están en su casilla avanzan una
+        while hashes[j] != EMPTY and (j - hashes[j]) & mask:
+            hashes[i], keys[i], values[i] = hashes[j], keys[j], values[j]
+            i, j = j, (j + 1) & mask
+        hashes[i], keys[i], values[i] = EMPTY, None, None
+        self.count -= 1
+        return True
+
+    def display(self):
+        for i in range(self.size):
+            if self._hashes[i] != EMPTY:
+                print(f"Index {i}: [{self._keys[i]!r}, {self._values[i]!r}]")
+
+
+def benchmark(n=200_000):
+    """
+    Inserts n int keys, looks each one up and deletes them all in HashTable and
+    RobinHoodHashTable, and prints ops/sec of each phase and the memory held by the full table.
+    """
+    keys = list(range(0, 7 * n, 7))
+    print(f"{'table':>20} {'insert/s':>12} {'get/s':>12} {'delete/s':>12} {'memory':>10}")
+    for cls in (HashTable, RobinHoodHashTable):
+        tracemalloc.start()
+        T = cls()
+        for k in keys:
+            T.insert(k, k)
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        T = cls()  # Los tiempos se miden sin tracemalloc, que ralentiza las reservas de memoria
+        start = perf_counter()
+        for k in keys:
+            T.insert(k, k)
+        t_insert = perf_counter() - start
+        start = perf_counter()
+        for k in keys:
+            T.get(k)
+        t_get = perf_counter() - start
+        start = perf_counter()
+        for k in keys:
+            T.delete(k)
+        t_delete = perf_counter() - start
+        print(
+            f"{cls.__name__:>20} {n / t_insert:>12,.0f} {n / t_get:>12,.0f} {n / t_delete:>12,.0f}"
+            f" {memory / 2**20:>8.1f}MiB"
+        )
+
+
+if __name__ == "__main__":
+    benchmark()
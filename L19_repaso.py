@@ -1,3 +1,13 @@
+import json
+import os
+import platform
+import random
+from struct import pack, unpack
+from time import perf_counter
+
+from lessons import is_ndarray, np
+
+
 # 1a) Preprocesamiento en tiempo Θ(n + k)
 def preprocess(L, k):
     count = [0] * (k + 1)
@@ -22,6 +32,10 @@ def sort_n_cubed(arr, n):
         exp *= n
 
 def counting_sort(arr, exp, base):
+    if is_ndarray(arr):
+        # Un arreglo de NumPy se ordena por el dígito de forma vectorizada (argsort estable)
+        arr[:] = arr[np.argsort((arr // exp) % base, kind="stable")]
+        return
     count = [0] * base
     output = [0] * len(arr)
     for num in arr:
@@ -37,46 +51,326 @@ def counting_sort(arr, exp, base):
         arr[i] = output[i]
 
 # 3a) Ordenar enteros con un total de n dígitos en O(n)
-def radix_sort(arr):
-    max_digits = max(len(str(num)) for num in arr)
-    for d in range(max_digits):
-        arr.sort(key=lambda x: (x // (10**d)) % 10)
+def radix_keys(arr, key=None):
+    # Convierte las claves (enteros con signo o flotantes) en enteros >= 0 que conservan el orden
+    keys = [key(x) for x in arr] if key is not None else list(arr)
+    if not keys:
+        return keys
+    if any(isinstance(k, float) for k in keys):
+        # Bits IEEE 754: se invierten los negativos y se marca el signo de los positivos.
+        # k + 0.0 convierte -0.0 en 0.0, que son iguales y deben tener la misma clave (estabilidad)
+        bits = [unpack("<Q", pack("<d", k + 0.0))[0] for k in keys]
+        return [b ^ 0xFFFFFFFFFFFFFFFF if b >> 63 else b | (1 << 63) for b in bits]
+    low = min(keys)
+    return [k - low for k in keys] if low < 0 else keys
+
+def radix_sort(arr, base=256, key=None, msd=False):
+    if is_ndarray(arr) and key is None:
+        arr.sort(kind="stable")  # NumPy usa radix sort para enteros pequeños y timsort para el resto
+        return arr
+    if msd:
+        return msd_radix_sort(arr, base, key)
+    n = len(arr)
+    keys = radix_keys(arr, key)
+    if n < 2:
+        return arr
+    max_key = max(keys)
+    # Buffers reservados una vez y reutilizados en todas las pasadas
+    zeros = [0] * base
+    count = [0] * base
+    items, out_items = list(arr), [None] * n
+    out_keys = [0] * n
+    digits = [0] * n
+    exp = 1
+    while exp <= max_key:
+        count[:] = zeros
+        for i in range(n):
+            d = (keys[i] // exp) % base
+            digits[i] = d
+            count[d] += 1
+        if count[digits[0]] != n:  # Si todos comparten el dígito la pasada no cambia nada
+            pos = 0
+            for d in range(base):
+                pos, count[d] = pos + count[d], pos
+            for i in range(n):
+                d = digits[i]
+                j = count[d]
+                out_items[j] = items[i]
+                out_keys[j] = keys[i]
+                count[d] = j + 1
+            items, out_items = out_items, items
+            keys, out_keys = out_keys, keys
+        exp *= base
+    arr[:] = items
+    return arr
+
+# 3a') Radix sort MSD: reparte por el dígito más significativo y solo sigue en los grupos con más
+# de un elemento, útil cuando las claves están sesgadas y los grupos se vacían rápido
+def msd_radix_sort(arr, base=256, key=None, cutoff=16):
+    n = len(arr)
+    keys = radix_keys(arr, key)
+    if n < 2:
+        return arr
+    exp = 1
+    while exp * base <= max(keys):
+        exp *= base
+    count = [0] * base
+    items = list(arr)
+    out_items, out_keys = [None] * n, [0] * n
+    stack = [(0, n, exp)]
+    while stack:
+        lo, hi, exp = stack.pop()
+        if hi - lo <= cutoff:  # Grupos pequeños: inserción estable por la clave completa
+            for i in range(lo + 1, hi):
+                item, k = items[i], keys[i]
+                j = i - 1
+                while j >= lo and keys[j] > k:
+                    items[j + 1], keys[j + 1] = items[j], keys[j]
+                    j -= 1
+                items[j + 1], keys[j + 1] = item, k
+            continue
+        digits = [(keys[i] // exp) % base for i in range(lo, hi)]
+        # En grupos con menos elementos que cubetas solo se recorren los dígitos presentes
+        present = sorted(set(digits)) if hi - lo < base else range(base)
+        for d in present:
+            count[d] = 0
+        for d in digits:
+            count[d] += 1
+        pos = lo
+        for d in present:
+            pos, count[d] = pos + count[d], pos
+        for i, d in zip(range(lo, hi), digits):
+            j = count[d]
+            out_items[j], out_keys[j] = items[i], keys[i]
+            count[d] = j + 1
+        items[lo:hi] = out_items[lo:hi]
+        keys[lo:hi] = out_keys[lo:hi]
+        if exp > 1:
+            start = lo
+            for d in present:  # count[d] es ahora el final del grupo d
+                if count[d] - start > 1:
+                    stack.append((start, count[d], exp // base))
+                start = count[d]
+    arr[:] = items
     return arr
 
 # 3b) Ordenar cadenas de texto lexicográficamente en O(n)
-def radix_sort_strings(arr):
+# Solo se examinan los caracteres que distinguen a las cadenas: el prefijo común de cada tramo
+# se salta de una vez, comparando la mínima y la máxima del tramo. Acepta str o bytes; key
+# extrae la cadena de cada elemento.
+def radix_sort_strings(arr, key=None, msd=False, cutoff=16):
+    n = len(arr)
+    if n < 2:
+        return arr
+    keys = [key(x) for x in arr] if key is not None else list(arr)
+    # bytes[d] ya es un entero; en str se usa ord solo en los caracteres que se examinan
+    char_at = _byte_at if isinstance(keys[0], (bytes, bytearray)) else _char_at
+    order = list(range(n))
+    if msd:
+        _msd_strings(order, keys, char_at, cutoff)
+    else:
+        _multikey_quicksort(order, keys, char_at, cutoff)
+    arr[:] = [arr[i] for i in order]
+    return arr
+
+def lsd_radix_sort_strings(arr):
+    # Versión original (LSD, una pasada de sort por carácter), se mantiene como referencia en L25
     max_length = max(len(s) for s in arr)
     for i in range(max_length - 1, -1, -1):
         arr.sort(key=lambda x: x[i] if i < len(x) else "")
     return arr
 
+def _common_prefix_length(a, b, d):
+    # Longitud del prefijo común de a y b, sabiendo que coinciden en los primeros d caracteres.
+    # Búsqueda binaria comparando rebanadas: cada comparación se hace en C, no carácter a carácter
+    lo, hi = d, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[lo:mid] == b[lo:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+def _skip_prefix(order, keys, lo, hi, d):
+    # Todas las cadenas del tramo están entre su mínima y su máxima: su prefijo común es el del tramo
+    sub = [keys[i] for i in order[lo:hi]]
+    return _common_prefix_length(min(sub), max(sub), d)
+
+def _char_at(s, d):
+    # Código del carácter d de la cadena s, o -1 si la cadena ya terminó
+    return ord(s[d]) if d < len(s) else -1
+
+def _byte_at(s, d):
+    return s[d] if d < len(s) else -1
+
+def _insertion_sort_strings(order, keys, lo, hi):
+    # Tramos pequeños: inserción estable comparando las cadenas completas
+    for i in range(lo + 1, hi):
+        current = order[i]
+        j = i - 1
+        while j >= lo and keys[order[j]] > keys[current]:
+            order[j + 1] = order[j]
+            j -= 1
+        order[j + 1] = current
+
+def _multikey_quicksort(order, keys, char_at, cutoff):
+    # Quicksort de tres vías de Bentley y Sedgewick sobre el carácter d (pila explícita)
+    stack = [(0, len(order), 0)]
+    while stack:
+        lo, hi, d = stack.pop()
+        if hi - lo <= cutoff:
+            _insertion_sort_strings(order, keys, lo, hi)
+            continue
+        d = _skip_prefix(order, keys, lo, hi, d)
+        mid = lo + (hi - lo) // 2
+        a, b, c = (char_at(keys[order[i]], d) for i in (lo, mid, hi - 1))
+        pivot = max(min(a, b), min(max(a, b), c))  # Mediana de tres
+        lt, i, gt = lo, lo, hi - 1
+        while i <= gt:
+            ch = char_at(keys[order[i]], d)
+            if ch < pivot:
+                order[lt], order[i] = order[i], order[lt]
+                lt += 1
+                i += 1
+            elif ch > pivot:
+                order[i], order[gt] = order[gt], order[i]
+                gt -= 1
+            else:
+                i += 1
+        stack.append((lo, lt, d))
+        stack.append((gt + 1, hi, d))
+        if pivot >= 0:  # Las iguales siguen con el siguiente carácter (si no terminaron)
+            stack.append((lt, gt + 1, d + 1))
+
+def _msd_strings(order, keys, char_at, cutoff):
+    # Radix sort MSD estable: reparte por el carácter d en cubetas (solo los caracteres presentes)
+    stack = [(0, len(order), 0)]
+    while stack:
+        lo, hi, d = stack.pop()
+        if hi - lo <= cutoff:
+            _insertion_sort_strings(order, keys, lo, hi)
+            continue
+        d = _skip_prefix(order, keys, lo, hi, d)
+        buckets = {}
+        for i in order[lo:hi]:
+            buckets.setdefault(char_at(keys[i], d), []).append(i)
+        start = lo
+        for ch in sorted(buckets):
+            bucket = buckets[ch]
+            order[start:start + len(bucket)] = bucket
+            if ch >= 0 and len(bucket) > 1:
+                stack.append((start, start + len(bucket), d + 1))
+            start += len(bucket)
+
 # 4) Quicksort mejorado con insertion sort
-def hybrid_quicksort(arr, k):
-    def quicksort(left, right):
+# Con k=None el corte se calibra en esta máquina para el tipo de los elementos (ver tuned_cutoff)
+def hybrid_quicksort(arr, k=None):
+    if k is None:
+        k = tuned_cutoff(arr)
+    stack = [(0, len(arr) - 1)]  # Pila explícita: no hay recursión
+    while stack:
+        left, right = stack.pop()
         if right - left < k:
-            return
-        pivot = arr[right]
-        i = left - 1
-        for j in range(left, right):
-            if arr[j] < pivot:
+            insertion_sort(arr, left, right + 1)  # Solo el tramo pequeño, no todo el arreglo
+            continue
+        # Mediana de tres como pivote
+        mid = (left + right) // 2
+        if arr[mid] < arr[left]:
+            arr[left], arr[mid] = arr[mid], arr[left]
+        if arr[right] < arr[left]:
+            arr[left], arr[right] = arr[right], arr[left]
+        if arr[right] < arr[mid]:
+            arr[mid], arr[right] = arr[right], arr[mid]
+        pivot = arr[mid]
+        # Partición en tres (bandera holandesa): los iguales al pivote quedan en arr[lt:gt + 1]
+        # y no se vuelven a procesar, así las claves repetidas no llevan a O(n^2)
+        lt, i, gt = left, left, right
+        while i <= gt:
+            if arr[i] < pivot:
+                arr[lt], arr[i] = arr[i], arr[lt]
+                lt += 1
                 i += 1
-                arr[i], arr[j] = arr[j], arr[i]
-        arr[i + 1], arr[right] = arr[right], arr[i + 1]
-        quicksort(left, i)
-        quicksort(i + 2, right)
-    
-    quicksort(0, len(arr) - 1)
-    insertion_sort(arr)
+            elif pivot < arr[i]:
+                arr[i], arr[gt] = arr[gt], arr[i]
+                gt -= 1
+            else:
+                i += 1
+        # El tramo menor se procesa primero: la pila no pasa de O(log n)
+        if lt - left > right - gt:
+            stack.append((left, lt - 1))
+            stack.append((gt + 1, right))
+        else:
+            stack.append((gt + 1, right))
+            stack.append((left, lt - 1))
 
-def insertion_sort(arr):
-    for i in range(1, len(arr)):
+def insertion_sort(arr, lo=0, hi=None):
+    if hi is None:
+        hi = len(arr)
+    for i in range(lo + 1, hi):
         key = arr[i]
         j = i - 1
-        while j >= 0 and arr[j] > key:
+        while j >= lo and arr[j] > key:
             arr[j + 1] = arr[j]
             j -= 1
         arr[j + 1] = key
 
+# 4b) Calibración del corte de hybrid_quicksort. El ganador se guarda por tipo de elemento,
+# máquina y versión de Python en un archivo JSON para no volver a medir en otras ejecuciones.
+CUTOFF_CANDIDATES = (4, 8, 12, 16, 24, 32, 48, 64)
+DEFAULT_CUTOFF = 16
+MIN_CALIBRATION_SIZE = 256  # Con menos elementos la muestra no es representativa
+CUTOFF_CACHE_PATH = os.environ.get(
+    "HYBRID_CUTOFF_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "hybrid_quicksort_cutoff.json")
+)
+_cutoff_cache = None
+
+def _cutoff_cache_key(arr):
+    return f"{type(arr[0]).__name__ if arr else 'empty'}|{platform.machine()}|{platform.python_version()}"
+
+def _load_cutoff_cache():
+    global _cutoff_cache
+    if _cutoff_cache is None:
+        try:
+            with open(CUTOFF_CACHE_PATH) as f:
+                _cutoff_cache = json.load(f)
+        except (OSError, ValueError):
+            _cutoff_cache = {}
+    return _cutoff_cache
+
+def calibrate_cutoff(sample, candidates=CUTOFF_CANDIDATES, repeat=5):
+    # Mide hybrid_quicksort con cada corte sobre la misma muestra y devuelve el más rápido
+    best_k, best_time = None, float("inf")
+    for k in candidates:
+        times = []
+        for _ in range(repeat):
+            work = list(sample)
+            start = perf_counter()
+            hybrid_quicksort(work, k)
+            times.append(perf_counter() - start)
+        t = sorted(times)[len(times) // 2]  # Mediana
+        if t < best_time:
+            best_k, best_time = k, t
+    return best_k
+
+def tuned_cutoff(arr, sample_size=2000, recalibrate=False):
+    cache = _load_cutoff_cache()
+    cache_key = _cutoff_cache_key(arr)
+    if cache_key in cache and not recalibrate:
+        return cache[cache_key]
+    if len(arr) < MIN_CALIBRATION_SIZE:
+        return DEFAULT_CUTOFF
+    rng = random.Random(0)
+    sample = [rng.choice(arr) for _ in range(sample_size)]  # Muestra con el tipo de datos real
+    cache[cache_key] = calibrate_cutoff(sample)
+    try:
+        os.makedirs(os.path.dirname(CUTOFF_CACHE_PATH), exist_ok=True)
+        with open(CUTOFF_CACHE_PATH, "w") as f:
+            json.dump(cache, f, indent=2)
+    except OSError:
+        pass  # Sin disco escribible el corte solo vive en memoria
+    return cache[cache_key]
+
 # 5) Multiplicación de matrices con Strassen
 def add_matrix(A, B):
     return [[A[i][j] + B[i][j] for j in range(len(A))] for i in range(len(A))]
@@ -176,3 +470,11 @@ def treap_delete(root, key):
             root = rotate_left(root)
             root.left = treap_delete(root.left, key)
     return root
+
+
+if __name__ == "__main__":
+    A = [(0.0, 0), (-0.0, 1), (-1.5, 2), (0.0, 3)]
+    print(radix_sort(list(A), key=lambda t: t[0]))
+    # [(-1.5, 2), (0.0, 0), (-0.0, 1), (0.0, 3)]
+    print(radix_sort(list(A), key=lambda t: t[0], msd=True) == sorted(A, key=lambda t: t[0]))
+    # True
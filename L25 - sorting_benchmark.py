@@ -0,0 +1,494 @@
+import argparse
+import json
+import os
+import random
+import sys
+import tracemalloc
+from functools import partial
+from typing import Callable
+
+from lessons import load_module
+
+timeit = load_module("L01 - timeit.py", "lesson_timeit").timeit
+
+
+# ---------------------------------------------------------------------------
+# Input distributions. Every generator returns (data, key).
+
+def gen_random(n, rng):
+    return [rng.randrange(n**3) for _ in range(n)], None
+
+
+def gen_sorted(n, rng):
+    return sorted(gen_random(n, rng)[0]), None
+
+
+def gen_reverse(n, rng):
+    return sorted(gen_random(n, rng)[0], reverse=True), None
+
+
+def gen_few_unique(n, rng):
+    values = [rng.randrange(n**3) for _ in range(8)]
+    return [rng.choice(values) for _ in range(n)], None
+
+
+def gen_organ_pipe(n, rng):
+    half = sorted(gen_random((n + 1) // 2, rng)[0])
+    return half + half[::-1][n % 2:], None
+
+
+def gen_nearly_sorted(n, rng):
+    A = sorted(gen_random(n, rng)[0])
+    for _ in range(max(1, n // 100)):  # ~1% of the elements out of place
+        i, j = rng.randrange(n), rng.randrange(n)
+        A[i], A[j] = A[j], A[i]
+    return A, None
+
+
+def gen_tuples(n, rng):
+    return [(rng.randrange(n), rng.randrange(n)) for _ in range(n)], lambda x: x[1]
+
+
+def gen_shared_prefix(n, rng):
+    # Log-like lines: a few long prefixes shared by many lines, distinguished near the end
+    prefixes = [f"2026-10-18T00:00:00Z host-{h:02d} service=api level=INFO " + "x" * 200 for h in range(4)]
+    return [f"{rng.choice(prefixes)}req={rng.randrange(n):08d}" for _ in range(n)], None
+
+
+def gen_long_prefix(n, rng):
+    # Every string shares a 2 KB prefix: string sorts that walk it one character at a time suffer
+    prefix = "p" * 2048
+    return [f"{prefix}{rng.randrange(10 * n)}" for _ in range(n)], None
+
+
+DISTRIBUTIONS = {
+    "random": gen_random,
+    "sorted": gen_sorted,
+    "reverse": gen_reverse,
+    "few_unique": gen_few_unique,
+    "organ_pipe": gen_organ_pipe,
+    "nearly_sorted": gen_nearly_sorted,
+    "tuples": gen_tuples,
+    "shared_prefix": gen_shared_prefix,
+    "long_prefix": gen_long_prefix,
+}
+
+STRING_DISTRIBUTIONS = {"shared_prefix", "long_prefix"}
+
+
+# ---------------------------------------------------------------------------
+# Algorithms. Every runner sorts A (a list owned by the benchmark) and returns the sorted list.
+
+class Algorithm:
+    def __init__(
+        self, name: str, run: Callable, supports_key: bool = True, integers_only: bool = False, strings_only: bool = False
+    ) -> None:
+        self.name = name
+        self.run = run  # run(A, key) -> list
+        self.supports_key = supports_key
+        self.integers_only = integers_only  # non-negative integers in [0, n^3)
+        self.strings_only = strings_only  # str or bytes
+
+    @property
+    def counts_comparisons(self) -> bool:
+        # Radix sorts look at digits/characters, so wrapping keys to count comparisons doesn't apply
+        return not (self.integers_only or self.strings_only)
+
+    def accepts(self, distribution: str) -> bool:
+        if distribution in STRING_DISTRIBUTIONS:
+            return not self.integers_only
+        if distribution == "tuples" and not self.supports_key:
+            return False
+        return not self.strings_only
+
+    def __repr__(self) -> str:
+        return self.name
+
+
+def _in_place(f):
+    def run(A, key):
+        if key is None:
+            f(A)
+        else:
+            f(A, key=key)
+        return A
+
+    return run
+
+
+def _returning(f):
+    def run(A, key):
+        return f(A) if key is None else f(A, key=key)
+
+    return run
+
+
+def default_algorithms() -> dict[str, Algorithm]:
+    insertion = load_module("L02 - insertion.py")
+    shell = load_module("L03 - shell.py")
+    selection = load_module("L04 - selection.py")
+    heapsort = load_module("L08 - heapsort.py")
+    mergesort = load_module("L10 - mergesort.py")
+    quicksort = load_module("L11 - quicksort.py")
+    repaso = load_module("L19_repaso.py")
+
+    def hybrid(A, key):
+        repaso.hybrid_quicksort(A, 16)
+        return A
+
+    def hybrid_tuned(A, key):
+        # Calibrated on first use, then read from the on-disk cache. The cutoff is looked up for
+        # the real element type even when comparisons are being counted through Counted wrappers.
+        sample = [x.value for x in A] if A and isinstance(A[0], Counted) else A
+        repaso.hybrid_quicksort(A, repaso.tuned_cutoff(sample))
+        return A
+
+    def n_cubed(A, key):
+        repaso.sort_n_cubed(A, max(2, len(A)))
+        return A
+
+    algorithms = [
+        Algorithm("insertion_sort", _in_place(insertion.insertion_sort)),
+        Algorithm("shell_sort", _in_place(shell.shell_sort)),
+        Algorithm("selection_sort", _in_place(selection.selection_sort)),
+        Algorithm("heapsort", _returning(heapsort.heapsort)),
+        Algorithm("heapsort_in_place", _returning(partial(heapsort.heapsort, in_place=True))),
+        Algorithm("merge_sort", _in_place(mergesort.merge_sort)),
+        Algorithm("natural_merge_sort", _in_place(mergesort.natural_merge_sort)),
+        Algorithm("quick_sort", _in_place(quicksort.quick_sort)),
+        Algorithm("intro_sort", _in_place(quicksort.intro_sort)),
+        Algorithm("hybrid_quicksort", hybrid, supports_key=False),
+        Algorithm("hybrid_quicksort_tuned", hybrid_tuned, supports_key=False),
+        Algorithm("radix_sort", _returning(repaso.radix_sort), integers_only=True),
+        Algorithm("sort_n_cubed", n_cubed, supports_key=False, integers_only=True),
+        Algorithm("lsd_string_sort", _returning(repaso.lsd_radix_sort_strings), supports_key=False, strings_only=True),
+        Algorithm("multikey_quicksort", _returning(repaso.radix_sort_strings), strings_only=True),
+        Algorithm(
+            "msd_string_sort",
+            _returning(partial(repaso.radix_sort_strings, msd=True)),
+            strings_only=True,
+        ),
+    ]
+    return {a.name: a for a in algorithms}
+
+
+# ---------------------------------------------------------------------------
+# Measurements
+
+class Counted:
+    """
+    Wraps a value and counts every comparison made against another Counted value.
+    """
+
+    __slots__ = ("value", "counter")
+
+    def __init__(self, value, counter: list) -> None:
+        self.value = value
+        self.counter = counter
+
+    def _cmp(self, other):
+        self.counter[0] += 1
+        return other.value if isinstance(other, Counted) else other
+
+    def __lt__(self, other):
+        return self.value < self._cmp(other)
+
+    def __le__(self, other):
+        return self.value <= self._cmp(other)
+
+    def __gt__(self, other):
+        return self.value > self._cmp(other)
+
+    def __ge__(self, other):
+        return self.value >= self._cmp(other)
+
+    def __eq__(self, other):
+        return self.value == self._cmp(other)
+
+    __hash__ = None
+
+
+def count_comparisons(algorithm: Algorithm, data: list, key: Callable) -> int:
+    counter = [0]
+    if algorithm.supports_key:
+        base = key or (lambda x: x)
+        algorithm.run(list(data), lambda x: Counted(base(x), counter))
+    else:
+        algorithm.run([Counted(x, counter) for x in data], None)
+    return counter[0]
+
+
+def count_key_calls(algorithm: Algorithm, data: list, key: Callable) -> int:
+    counter = [0]
+    base = key or (lambda x: x)
+
+    def counting_key(x):
+        counter[0] += 1
+        return base(x)
+
+    algorithm.run(list(data), counting_key)
+    return counter[0]
+
+
+def peak_memory(algorithm: Algorithm, data: list, key: Callable) -> int:
+    A = list(data)
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        start, _ = tracemalloc.get_traced_memory()
+        algorithm.run(A, key)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak - start
+
+
+def time_algorithm(algorithm: Algorithm, data: list, key: Callable, repeat: int, warmup: int):
+    A = []
+    result = []
+
+    def setup():
+        A[:] = data
+
+    @timeit(repeat, warmup=warmup, disable_gc=True, setup=setup)
+    def run():
+        result[:] = algorithm.run(A, key)
+
+    run()
+    return run.last_stats, result
+
+
+def bench_one(algorithm: Algorithm, distribution: str, n: int, repeat: int = 5, warmup: int = 1, seed: int = 0) -> dict:
+    data, key = DISTRIBUTIONS[distribution](n, random.Random(seed))
+    record = {"algorithm": algorithm.name, "distribution": distribution, "size": n}
+    try:
+        stats, result = time_algorithm(algorithm, data, key, repeat, warmup)
+        record.update({k: v for k, v in stats.as_dict().items() if k not in ("name", "n", "warmup")})
+        expected = sorted(data, key=key)
+        k = key or (lambda x: x)
+        record["ok"] = sorted(result) == sorted(data) and [k(x) for x in result] == [k(x) for x in expected]
+        record["stable"] = result == expected
+        record["comparisons"] = count_comparisons(algorithm, data, key) if algorithm.counts_comparisons else None
+        record["key_calls"] = count_key_calls(algorithm, data, key) if algorithm.supports_key else None
+        record["peak_memory"] = peak_memory(algorithm, data, key)
+    except (RecursionError, MemoryError, TypeError, ValueError) as e:
+        record["error"] = type(e).__name__
+    return record
+
+
+def run_suite(
+    sizes: list[int],
+    distributions: list[str] = None,
+    algorithms: list[str] = None,
+    repeat: int = 5,
+    warmup: int = 1,
+    seed: int = 0,
+    verbose: bool = True,
+) -> list[dict]:
+    """
+    Runs every algorithm over every size and distribution and returns one record per run.
+
+    Parameters
+    ----------
+    sizes: list[int]
+        Input sizes.
+    distributions: list[str]
+        Names from DISTRIBUTIONS. Defaults to all of them.
+    algorithms: list[str]
+        Names from default_algorithms(). Defaults to all of them.
+    repeat: int
+        Timed executions per run. Defaults to 5.
+    warmup: int
+        Untimed executions per run. Defaults to 1.
+    seed: int
+        Seed for the input generators, so that runs are comparable. Defaults to 0.
+    verbose: bool
+        Whether to print every record as it is produced. Defaults to True.
+    """
+    available = default_algorithms()
+    distributions = distributions or list(DISTRIBUTIONS)
+    algorithms = [available[a] for a in (algorithms or available)]
+    records = []
+
+    for n in sizes:
+        for distribution in distributions:
+            for algorithm in algorithms:
+                if not algorithm.accepts(distribution):
+                    continue
+                record = bench_one(algorithm, distribution, n, repeat, warmup, seed)
+                records.append(record)
+                if verbose:
+                    print(format_record(record))
+    return records
+
+
+def format_record(record: dict) -> str:
+    head = f"{record['algorithm']:>22} {record['distribution']:>14} n={record['size']:<8}"
+    if "error" in record:
+        return f"{head} ERROR {record['error']}"
+    comparisons = "-" if record["comparisons"] is None else record["comparisons"]
+    key_calls = "-" if record.get("key_calls") is None else record["key_calls"]
+    return (
+        f"{head} median {record['median']:.6f}s p95 {record['p95']:.6f}s "
+        f"cmp {comparisons} key {key_calls} mem {record['peak_memory']}B{'' if record['ok'] else ' WRONG'}"
+    )
+
+
+def parallel_speedup(n: int, max_workers: int, distribution: str = "random", repeat: int = 3, seed: int = 0) -> list[dict]:
+    """
+    Times parallel_merge_sort with 1..max_workers processes on the same input and returns one
+    record per worker count with its median time and speedup over 1 worker.
+    """
+    mergesort = load_module("L10 - mergesort.py")
+    data, key = DISTRIBUTIONS[distribution](n, random.Random(seed))
+    records = []
+
+    for workers in range(1, max_workers + 1):
+        algorithm = Algorithm(f"parallel_merge_sort[{workers}]", _in_place(partial(mergesort.parallel_merge_sort, workers=workers)))
+        stats, _ = time_algorithm(algorithm, data, key, repeat, 0)
+        records.append({"workers": workers, "size": n, "distribution": distribution, "median": stats.median})
+
+    for record in records:
+        record["speedup"] = records[0]["median"] / record["median"]
+    return records
+
+
+# ---------------------------------------------------------------------------
+# Priority queue arity
+
+HEAP_MIXES = {  # Weights of (insert, extract, decrease_key)
+    "dijkstra": (0.15, 0.15, 0.70),
+    "scheduler": (0.40, 0.40, 0.20),
+    "extract_heavy": (0.10, 0.80, 0.10),
+}
+
+
+def heap_workload(arity: int, n: int, ops: int, mix: str, repeat: int = 3, seed: int = 0):
+    """
+    Times a min PriorityQueue of the given arity that starts with n elements and then runs ops
+    random inserts, extractions and decrease-keys in the proportions of HEAP_MIXES[mix].
+    Every arity sees exactly the same sequence of operations.
+    """
+    load_module("L08 - heapsort.py")
+    PriorityQueue = load_module("L09 - priority_queue.py").PriorityQueue
+    HeapType = sys.modules["heapsort"].HeapType
+    weights = HEAP_MIXES[mix]
+
+    @timeit(repeat, disable_gc=True)
+    def run():
+        rng = random.Random(seed)
+        pq = PriorityQueue([(i, rng.random()) for i in range(n)], HeapType.MIN, lambda x: x[1], arity)
+        next_id = n
+        for op in rng.choices(range(3), weights, k=ops):
+            if op == 0 or pq.heap_size == 0:
+                pq.upsert((next_id, rng.random()))
+                next_id += 1
+            elif op == 1:
+                pq.extract_extremum()
+            else:
+                e = pq._heap[rng.randrange(pq.heap_size)]
+                pq.decrease_key((e[0], e[1] * rng.random()))
+
+    run()
+    return run.last_stats
+
+
+def heap_arity_report(arities: list[int], n: int, ops: int, repeat: int = 3, seed: int = 0) -> list[dict]:
+    records = []
+    for mix in HEAP_MIXES:
+        for arity in arities:
+            stats = heap_workload(arity, n, ops, mix, repeat, seed)
+            records.append({"mix": mix, "arity": arity, "size": n, "ops": ops, "median": stats.median})
+    return records
+
+
+# ---------------------------------------------------------------------------
+# Baselines
+
+def save_baseline(records: list[dict], path: str) -> None:
+    with open(path, "w") as f:
+        json.dump({"python": sys.version.split()[0], "records": records}, f, indent=2)
+
+
+def load_baseline(path: str) -> list[dict]:
+    with open(path) as f:
+        return json.load(f)["records"]
+
+
+def find_regressions(records: list[dict], baseline: list[dict], tolerance: float = 0.2) -> list[dict]:
+    """
+    Compares records against a previous baseline and returns the ones that got worse.
+
+    A run regresses when its median time grows by more than ``tolerance`` (relative), when it
+    makes more comparisons or key calls or when it fails where it used to succeed.
+    """
+    previous = {(r["algorithm"], r["distribution"], r["size"]): r for r in baseline}
+    regressions = []
+
+    for record in records:
+        old = previous.get((record["algorithm"], record["distribution"], record["size"]))
+        if old is None or "error" in old:
+            continue
+        reasons = []
+        if "error" in record:
+            reasons.append(f"now fails with {record['error']}")
+        else:
+            if record["median"] > old["median"] * (1 + tolerance):
+                reasons.append(f"median {old['median']:.6f}s -> {record['median']:.6f}s")
+            for counter in ("comparisons", "key_calls"):
+                if record.get(counter) is not None and old.get(counter) is not None and record[counter] > old[counter]:
+                    reasons.append(f"{counter} {old[counter]} -> {record[counter]}")
+            if not record["ok"]:
+                reasons.append("wrong result")
+        if reasons:
+            regressions.append({**record, "reasons": reasons})
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the sorting algorithms of the course.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 500])
+    parser.add_argument("--distributions", nargs="+", choices=list(DISTRIBUTIONS))
+    parser.add_argument("--algorithms", nargs="+")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", help="Write the results to this JSON baseline")
+    parser.add_argument("--compare", help="Flag regressions against this JSON baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--parallel", type=int, metavar="N", help="Only print the parallel_merge_sort speedup curve for 1..N workers")
+    parser.add_argument("--heap-arity", type=int, nargs="+", metavar="D", help="Only compare PriorityQueue arities on insert/extract/decrease-key mixes")
+    parser.add_argument("--heap-ops", type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    if args.heap_arity:
+        for n in args.sizes:
+            records = heap_arity_report(args.heap_arity, n, args.heap_ops, args.repeat, args.seed)
+            for mix in HEAP_MIXES:
+                best = min((r for r in records if r["mix"] == mix), key=lambda r: r["median"])
+                for r in records:
+                    if r["mix"] == mix:
+                        mark = " <- best" if r is best else ""
+                        print(f"{mix:>14} n={n:<8} arity={r['arity']:<3} median {r['median']:.6f}s{mark}")
+        return 0
+
+    if args.parallel:
+        for n in args.sizes:
+            for r in parallel_speedup(n, args.parallel, (args.distributions or ["random"])[0], args.repeat, args.seed):
+                print(f"parallel_merge_sort n={n:<8} workers={r['workers']:<3} median {r['median']:.6f}s speedup {r['speedup']:.2f}x")
+        return 0
+
+    records = run_suite(args.sizes, args.distributions, args.algorithms, args.repeat, args.warmup, args.seed)
+    if args.save:
+        save_baseline(records, args.save)
+
+    if args.compare:
+        regressions = find_regressions(records, load_baseline(args.compare), args.tolerance)
+        for r in regressions:
+            print(f"REGRESSION {r['algorithm']} {r['distribution']} n={r['size']}: {'; '.join(r['reasons'])}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+import os
+import pickle
+import shutil
+import tempfile
+from heapq import merge
+from itertools import islice
+from typing import Callable, Iterable, Iterator, TypeVar
+
+from lessons import load_module
+
+T = TypeVar("T")
+
+BLOCK_SIZE = 1024  # Elements pickled together in a run file
+
+
+merge_sort = load_module("L10 - mergesort.py").merge_sort
+
+_END = object()  # Marks the end of the input
+
+
+def _write_run(items: Iterable[T], directory: str) -> str:
+    """
+    Writes items (already sorted) to a new run file as a stream of pickled blocks and returns its path.
+    """
+    fd, path = tempfile.mkstemp(suffix=".run", dir=directory)
+    with os.fdopen(fd, "wb") as f:
+        it = iter(items)
+        while block := list(islice(it, BLOCK_SIZE)):
+            pickle.dump(block, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return path
+
+
+def _read_run(path: str) -> Iterator[T]:
+    """
+    Yields the elements of a run file one block at a time, so only BLOCK_SIZE elements are in memory.
+    """
+    with open(path, "rb") as f:
+        while True:
+            try:
+                block = pickle.load(f)
+            except EOFError:
+                return
+            yield from block
+
+
+def _merge_runs(paths: list[str], key: Callable, reverse: bool) -> Iterator[T]:
+    # heapq.merge is stable: on ties the element of the earlier run comes first
+    return merge(*(_read_run(p) for p in paths), key=key, reverse=reverse)
+
+
+def external_sort(
+    iterable: Iterable[T],
+    key: Callable = None,
+    reverse: bool = False,
+    chunk_size: int = 100_000,
+    tmpdir: str = None,
+    max_open_runs: int = 64,
+) -> Iterator[T]:
+    """
+    Sorts an iterable that may not fit in memory and yields its elements in order.
+
+    The input is read in chunks of chunk_size elements, each chunk is sorted with merge_sort and
+    spilled to a temporary run file, and the runs are merged with a streaming k-way merge. When
+    there are more than max_open_runs runs, groups of max_open_runs - 1 of them are merged into
+    longer runs first, so counting the file being written never more than max_open_runs files are
+    open at once (3 when max_open_runs is 2, since a merge needs two inputs). Memory stays
+    O(chunk_size + max_open_runs * BLOCK_SIZE) regardless of the input size. Stable.
+
+    Parameters
+    ----------
+    iterable: Iterable[T]
+        Elements to sort. Must be picklable.
+    key: Callable
+        Function used to compare elements. Defaults to comparing the elements themselves.
+    reverse: bool
+        Whether to sort in decreasing order or not. Defaults to False.
+    chunk_size: int
+        Number of elements sorted in memory at a time. Defaults to 100_000.
+    tmpdir: str
+        Directory for the run files. Defaults to the system temporary directory.
+    max_open_runs: int
+        Maximum number of run files open at once, including the output of an intermediate merge.
+        Defaults to 64.
+    """
+    if chunk_size < 1 or max_open_runs < 2:
+        raise ValueError("chunk_size debe ser al menos 1 y max_open_runs al menos 2")
+    sort_key = key if key is not None else (lambda x: x)
+    it = iter(iterable)
+
+    chunk = list(islice(it, chunk_size))
+    merge_sort(chunk, sort_key, reverse, bottom_up=True)
+    following = next(it, _END)
+    if following is _END:  # Everything fits in one chunk: no need to touch the disk
+        yield from chunk
+        return
+
+    directory = tempfile.mkdtemp(prefix="external_sort_", dir=tmpdir)
+    try:
+        runs = [_write_run(chunk, directory)]
+        while following is not _END:
+            del chunk  # The previous chunk is freed before the next one is read
+            chunk = [following]
+            chunk.extend(islice(it, chunk_size - 1))
+            merge_sort(chunk, sort_key, reverse, bottom_up=True)
+            runs.append(_write_run(chunk, directory))
+            following = next(it, _END)
+        del chunk
+
+        # Multi-pass merge: runs are merged in order, so stability is preserved
+        fan_in = max(2, max_open_runs - 1)  # One more file is open for the merged output
+        while len(runs) > max_open_runs:
+            merged = []
+            for i in range(0, len(runs), fan_in):
+                group = runs[i:i + fan_in]
+                if len(group) == 1:  # A run left over is carried to the next pass without copying
+                    merged.append(group[0])
+                    continue
+                merged.append(_write_run(_merge_runs(group, key, reverse), directory))
+                for path in group:
+                    os.remove(path)
+            runs = merged
+
+        yield from _merge_runs(runs, key, reverse)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    from random import randrange
+
+    A = [(randrange(100), i) for i in range(10_000)]
+    S = list(external_sort(iter(A), key=lambda x: x[0], chunk_size=500, max_open_runs=4))
+    print(S == sorted(A, key=lambda x: x[0]))
+    # True
+    print(list(external_sort([3, 2, 5, 1, 9, 0, 8, 6, 7, 4], chunk_size=3, reverse=True)))
+    # [9, 8, 7, 6, 5, 4, 3, 2, 1, 0]
@@ -0,0 +1,330 @@
+import mmap
+import os
+from struct import pack_into, unpack_from
+
+HEADER_SIZE = 32  # segment_size, head, tail, reserved: cuatro enteros de 64 bits
+FOOTER_SIZE = 8  # Fin de los datos del segmento (0 mientras el segmento sigue abierto)
+
+
+def _record_size(n: int) -> int:
+    # Longitud + datos + longitud repetida (para recorrer hacia atrás), redondeado a 8 bytes
+    return (n + 15) & ~7
+
+
+class SegmentLog:
+    """
+    Persistent log of byte records stored in fixed-size, memory-mapped segment files.
+
+    Every record is framed as a 4-byte length, the payload and the length again, padded to 8
+    bytes, and never crosses a segment: when it doesn't fit, the segment is closed (its footer
+    stores where its data ends) and the record goes at the start of the next one. A small
+    header file holds the logical head and tail offsets, so reopening a log is O(1). Only the
+    segments at the head and at the tail are mapped, so the log can be much larger than RAM.
+    Segments are deleted as soon as the head (or, popping from the tail, the tail) leaves them.
+
+    Records are read back as memoryviews into the mapped file, without copying. Space behind the
+    head is never reused, so a view returned by pop_first stays valid while it is referenced
+    (a deleted segment stays mapped until its last view is released); one returned by pop_last
+    is overwritten by the next append.
+
+    Parameters
+    ----------
+    path: str
+        Directory of the log. Created if it does not exist.
+    segment_size: int
+        Size of each segment file in bytes, rounded up to a multiple of mmap.ALLOCATIONGRANULARITY.
+        Ignored when reopening an existing log. Defaults to 64 MiB.
+    sync: bool
+        Whether to flush the segment and the header to disk after every change. Defaults to
+        False (call flush or close).
+    """
+
+    def __init__(self, path: str, segment_size: int = 64 << 20, sync: bool = False) -> None:
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.sync = sync
+        header_path = os.path.join(path, "header")
+        if not os.path.exists(header_path):
+            gran = mmap.ALLOCATIONGRANULARITY
+            segment_size = max(gran, -(-segment_size // gran) * gran)
+            with open(header_path, "wb") as f:
+                f.write(bytes(HEADER_SIZE))
+                f.seek(0)
+                f.write(segment_size.to_bytes(8, "little"))
+        self._header_file = open(header_path, "r+b")
+        self._header_map = mmap.mmap(self._header_file.fileno(), HEADER_SIZE)
+        self._header = memoryview(self._header_map).cast("Q")  # [segment_size, head, tail, -]
+        self.segment_size = self._header[0]
+        self._maps = {}  # segmento -> (mmap, memoryview)
+        self._retired = []  # mmaps que no se pudieron cerrar porque aún hay vistas sobre ellos
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @property
+    def head(self) -> int:
+        return self._header[1]
+
+    @property
+    def tail(self) -> int:
+        return self._header[2]
+
+    @property
+    def nbytes(self) -> int:
+        # Bytes entre la cabeza y la cola (registros con su enmarcado, más huecos al final de segmentos)
+        return self._header[2] - self._header[1]
+
+    def _segment_path(self, seg: int) -> str:
+        return os.path.join(self.path, f"{seg:012d}.seg")
+
+    def _view(self, seg: int) -> memoryview:
+        # Proyecta el segmento en memoria (creándolo vacío si no existe)
+        if seg not in self._maps:
+            path = self._segment_path(seg)
+            with open(path, "a+b") as f:
+                if os.fstat(f.fileno()).st_size < self.segment_size:
+                    f.truncate(self.segment_size)
+                mm = mmap.mmap(f.fileno(), self.segment_size)
+            self._maps[seg] = (mm, memoryview(mm))
+        return self._maps[seg][1]
+
+    def _unmap(self, seg: int) -> None:
+        mm, view = self._maps.pop(seg, (None, None))
+        if mm is None:
+            return
+        view.release()
+        mm.flush()
+        self._retired.append(mm)
+        still_used = []
+        for mm in self._retired:
+            try:
+                mm.close()
+            except BufferError:  # El usuario aún tiene una vista de un registro de este segmento
+                still_used.append(mm)
+        self._retired = still_used
+
+    def _drop(self, seg: int) -> None:
+        # Segmento consumido: se libera la proyección y se borra el fichero
+        self._unmap(seg)
+        try:
+            os.remove(self._segment_path(seg))
+        except FileNotFoundError:
+            pass
+
+    def _footer(self, seg: int) -> int:
+        return unpack_from("<Q", self._view(seg), self.segment_size - FOOTER_SIZE)[0]
+
+    def _set_footer(self, seg: int, end: int) -> None:
+        pack_into("<Q", self._view(seg), self.segment_size - FOOTER_SIZE, end)
+
+    def _release_unused(self) -> None:
+        keep = {self._header[1] // self.segment_size, self._header[2] // self.segment_size}
+        for seg in [s for s in self._maps if s not in keep]:
+            self._unmap(seg)
+
+    def _flush(self, seg: int) -> None:
+        if self.sync:
+            self._maps[seg][0].flush()
+            self._header_map.flush()
+
+    def is_empty(self) -> bool:
+        return self._header[1] == self._header[2]
+
+    def append(self, data) -> None:
+        data = memoryview(data).cast("B")
+        n = len(data)
+        size = _record_size(n)
+        S = self.segment_size
+        if size > S - FOOTER_SIZE:
+            raise ValueError("El registro no cabe en un segmento")
+        tail = self._header[2]
+        seg, pos = divmod(tail, S)
+        consumed = None
+        if pos + size > S - FOOTER_SIZE:  # No cabe: se cierra el segmento y se pasa al siguiente
+            self._set_footer(seg, pos)
+            self._maps[seg][0].flush()
+            if self._header[1] == tail:  # Ya se había consumido entero
+                consumed = seg
+            seg, pos = seg + 1, 0
+        view = self._view(seg)
+        pack_into("<I", view, pos, n)
+        view[pos + 4:pos + 4 + n] = data
+        pack_into("<I", view, pos + size - 4, n)
+        self._header[2] = seg * S + pos + size  # La cola se publica después de los datos
+        if consumed is not None:
+            self._header[1] = seg * S
+            self._drop(consumed)
+        self._release_unused()
+        self._flush(seg)
+
+    def _first(self):
+        # (segmento, inicio, longitud) del primer registro
+        if self.is_empty():
+            raise IndexError("El log está vacío")
+        seg, pos = divmod(self._header[1], self.segment_size)
+        return seg, pos, unpack_from("<I", self._view(seg), pos)[0]
+
+    def peek_first(self) -> memoryview:
+        seg, pos, n = self._first()
+        return self._view(seg)[pos + 4:pos + 4 + n]
+
+    def pop_first(self) -> memoryview:
+        seg, pos, n = self._first()
+        record = self._view(seg)[pos + 4:pos + 4 + n]
+        pos += _record_size(n)
+        if pos == self._footer(seg):  # Segmento cerrado y consumido: la cabeza pasa al siguiente
+            self._header[1] = (seg + 1) * self.segment_size
+            self._drop(seg)
+        else:
+            self._header[1] = seg * self.segment_size + pos
+            self._flush(seg)
+        return record
+
+    def _last(self):
+        # (segmento, inicio, longitud) del último registro
+        if self.is_empty():
+            raise IndexError("El log está vacío")
+        seg, pos = divmod(self._header[2], self.segment_size)
+        n = unpack_from("<I", self._view(seg), pos - 4)[0]
+        return seg, pos - _record_size(n), n
+
+    def peek_last(self) -> memoryview:
+        seg, start, n = self._last()
+        return self._view(seg)[start + 4:start + 4 + n]
+
+    def pop_last(self) -> memoryview:
+        seg, start, n = self._last()
+        record = self._view(seg)[start + 4:start + 4 + n]
+        S = self.segment_size
+        if start == 0 and seg * S != self._header[1]:
+            # Segmento vacío: la cola vuelve al final de los datos del anterior, que se reabre
+            end = self._footer(seg - 1)
+            self._set_footer(seg - 1, 0)
+            self._header[2] = (seg - 1) * S + end
+            self._drop(seg)
+            seg -= 1
+        else:
+            self._header[2] = seg * S + start
+        self._flush(seg)
+        return record
+
+    def clear(self) -> None:
+        # Descarta todos los registros y borra los segmentos ya no necesarios
+        S = self.segment_size
+        first, last = self._header[1] // S, self._header[2] // S
+        self._header[1] = self._header[2] = (last + 1) * S
+        for seg in range(first, last + 1):
+            self._drop(seg)
+        self._header_map.flush()
+
+    def flush(self) -> None:
+        for mm, _ in self._maps.values():
+            mm.flush()
+        self._header_map.flush()
+
+    def close(self) -> None:
+        self.flush()
+        for seg in list(self._maps):
+            self._unmap(seg)
+        self._header.release()
+        self._header_map.close()
+        self._header_file.close()
+
+
+class PersistentQueue:
+    """
+    FIFO queue of byte records with the API of Queue (L06), stored in a SegmentLog at path.
+    poll returns a memoryview of the record, without copying.
+    """
+
+    def __init__(self, path: str, segment_size: int = 64 << 20, sync: bool = False) -> None:
+        self._log = SegmentLog(path, segment_size, sync)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def peek(self) -> memoryview:
+        if self.is_empty():
+            raise IndexError("La cola está vacía")
+        return self._log.peek_first()
+
+    def poll(self) -> memoryview:
+        if self.is_empty():
+            raise IndexError("La cola está vacía")
+        return self._log.pop_first()
+
+    def offer(self, e) -> None:
+        self._log.append(e)
+
+    def is_empty(self) -> bool:
+        return self._log.is_empty()
+
+    def clear(self) -> None:
+        self._log.clear()
+
+    def close(self) -> None:
+        self._log.close()
+
+
+class PersistentStack:
+    """
+    LIFO stack of byte records with the API of Stack (L05), stored in a SegmentLog at path.
+    pop returns a memoryview of the record, valid until the next push.
+    """
+
+    def __init__(self, path: str, segment_size: int = 64 << 20, sync: bool = False) -> None:
+        self._log = SegmentLog(path, segment_size, sync)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def top(self) -> memoryview:
+        if self.is_empty():
+            raise IndexError("La pila está vacía")
+        return self._log.peek_last()
+
+    def pop(self) -> memoryview:
+        if self.is_empty():
+            raise IndexError("La pila está vacía")
+        return self._log.pop_last()
+
+    def push(self, e) -> None:
+        self._log.append(e)
+
+    def is_empty(self) -> bool:
+        return self._log.is_empty()
+
+    def clear(self) -> None:
+        self._log.clear()
+
+    def close(self) -> None:
+        self._log.close()
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    directory = tempfile.mkdtemp()
+    with PersistentQueue(os.path.join(directory, "queue"), segment_size=4096) as Q:
+        for i in range(1000):
+            Q.offer(str(i).encode())
+        print(bytes(Q.poll()), bytes(Q.peek()))
+        # b'0' b'1'
+    with PersistentQueue(os.path.join(directory, "queue")) as Q:  # Se reabre desde la cabecera
+        print(bytes(Q.poll()))
+        # b'1'
+
+    with PersistentStack(os.path.join(directory, "stack"), segment_size=4096) as S:
+        for i in range(1000):
+            S.push(str(i).encode())
+        print(bytes(S.pop()), bytes(S.top()))
+        # b'999' b'998'
@@ -0,0 +1,39 @@
+import importlib.util
+import os
+import re
+import sys
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: sin él las lecciones solo ordenan listas
+    np = None
+
+DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def is_ndarray(A) -> bool:
+    # Whether A is a NumPy array (always False when NumPy is not installed)
+    return np is not None and isinstance(A, np.ndarray)
+
+
+def load_module(filename: str, name: str = None):
+    """
+    Loads one of the lesson files (whose names contain spaces and can't be imported directly) as a module.
+
+    Parameters
+    ----------
+    filename: str
+        File name relative to this directory, e.g. "L10 - mergesort.py", or an absolute path.
+    name: str
+        Module name. Defaults to the file name without the "Lxx - " prefix and the extension, which is
+        the name the lesson files use to import each other (e.g. ``from heapsort import *``).
+    """
+    if name is None:
+        name = re.sub(r"^L\d+( - |_)", "", os.path.splitext(os.path.basename(filename))[0])
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, os.path.join(DIR, filename))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module